@@ -9,23 +9,18 @@ from typing import List, Optional
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Only lightweight modules are imported here. Command-specific modules (the
+# enhancer pulls in litellm) are imported inside the cmd_* handlers so that
+# --version, --help and the listing commands start quickly.
 from core.config import ConfigManager
-from core.enhancer import PromptEnhancer
-from core.history import HistoryManager
-from core.projects import ProjectManager
-from core.llm_models import get_all_provider_ids, get_provider_models, get_provider_display_name
+from core.constants import REASONING_MODES, VERBOSITY_LEVELS
 from core.version import __version__
 
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
 
-def setup_argparse() -> argparse.ArgumentParser:
-    """Set up argument parser with all CLI options."""
-    parser = argparse.ArgumentParser(
-        description=f"PromptAlchemy v{__version__} - Transform simple prompts into sophisticated LLM prompts",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+# Examples shown at the end of the top-level --help output
+_EPILOG = """
 Examples:
   # Enhance a prompt
   promptalchemy enhance "Create a todo app" -p openai -m gpt-4o-mini
@@ -42,24 +37,24 @@ Examples:
   # Create a project
   promptalchemy project create "My Project"
         """
-    )
 
-    parser.add_argument('--version', action='version', version=f'PromptAlchemy v{__version__}')
+# Authentication modes accepted by --auth-mode
+_AUTH_MODES = ('api-key', 'gcloud')
 
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
-    # Enhance command
+def _build_enhance_parser(subparsers) -> None:
+    """Register the enhance subcommand."""
     enhance_parser = subparsers.add_parser('enhance', help='Enhance a prompt')
     enhance_parser.add_argument('prompt', nargs='?', help='Prompt to enhance')
     enhance_parser.add_argument('-i', '--input', type=Path, help='Input file containing prompt')
     enhance_parser.add_argument('-o', '--output', type=Path, help='Output file for enhanced prompt')
     enhance_parser.add_argument('-p', '--provider', default='openai', help='LLM provider (default: openai)')
-    enhance_parser.add_argument('--auth-mode', choices=['api-key', 'gcloud'], help='Authentication mode (default: api-key for most, config for gemini)')
+    enhance_parser.add_argument('--auth-mode', choices=_AUTH_MODES, help='Authentication mode (default: api-key for most, config for gemini)')
     enhance_parser.add_argument('-m', '--model', help='Model name (default: provider default)')
     enhance_parser.add_argument('-r', '--role', help='Role specification')
-    enhance_parser.add_argument('--reasoning', choices=['Standard', 'Deep Think', 'Ultra Think', 'Chain of Thought', 'Step by Step'],
+    enhance_parser.add_argument('--reasoning', choices=REASONING_MODES,
                                 help='Reasoning mode')
-    enhance_parser.add_argument('-v', '--verbosity', choices=['minimal', 'concise', 'medium', 'detailed', 'comprehensive'],
+    enhance_parser.add_argument('-v', '--verbosity', choices=VERBOSITY_LEVELS,
                                 help='Verbosity level')
     enhance_parser.add_argument('-t', '--tools', nargs='+', help='Tools to include (e.g., web code pdf)')
     enhance_parser.add_argument('--self-reflect', action='store_true', help='Enable self-reflection')
@@ -71,8 +66,13 @@ Examples:
     enhance_parser.add_argument('-a', '--attach', type=Path, action='append', help='Attach files (can be used multiple times)')
     enhance_parser.add_argument('--temperature', type=float, default=0.7, help='Model temperature (default: 0.7)')
     enhance_parser.add_argument('--project', help='Save to project collection')
+    enhance_parser.add_argument('--no-cache', action='store_true', help='Always call the LLM, ignoring cached results')
+    enhance_parser.add_argument('--batch', action='store_true', help='Treat each non-empty input line as a separate prompt')
+    enhance_parser.add_argument('--concurrency', type=int, default=4, help='Maximum parallel requests in batch mode (default: 4)')
+
 
-    # History command
+def _build_history_parser(subparsers) -> None:
+    """Register the history subcommand."""
     history_parser = subparsers.add_parser('history', help='Manage history')
     history_subparsers = history_parser.add_subparsers(dest='history_command')
 
@@ -89,13 +89,15 @@ Examples:
     history_export.add_argument('output', type=Path, help='Output file')
     history_export.add_argument('-f', '--format', choices=['json', 'jsonl'], default='json', help='Export format')
 
-    history_clear = history_subparsers.add_parser('clear', help='Clear all history')
+    history_subparsers.add_parser('clear', help='Clear all history')
+
 
-    # Project command
+def _build_project_parser(subparsers) -> None:
+    """Register the project subcommand."""
     project_parser = subparsers.add_parser('project', help='Manage projects')
     project_subparsers = project_parser.add_subparsers(dest='project_command')
 
-    project_list = project_subparsers.add_parser('list', help='List all projects')
+    project_subparsers.add_parser('list', help='List all projects')
 
     project_create = project_subparsers.add_parser('create', help='Create a project')
     project_create.add_argument('name', help='Project name')
@@ -103,15 +105,24 @@ Examples:
 
     project_show = project_subparsers.add_parser('show', help='Show project prompts')
     project_show.add_argument('name', help='Project name')
+    project_show.add_argument('-l', '--limit', type=int, help='Maximum number of prompts (most recent first)')
 
     project_export = project_subparsers.add_parser('export', help='Export project')
     project_export.add_argument('name', help='Project name')
     project_export.add_argument('output', type=Path, help='Output file')
 
-    # Providers command
-    providers_parser = subparsers.add_parser('providers', help='List available providers and models')
+    project_compress = project_subparsers.add_parser('compress', help='Compress large project prompt files with zstd')
+    project_compress.add_argument('name', help='Project name')
+    project_compress.add_argument('--off', action='store_true', help='Disable compression and decompress')
+
+
+def _build_providers_parser(subparsers) -> None:
+    """Register the providers subcommand."""
+    subparsers.add_parser('providers', help='List available providers and models')
 
-    # Config command
+
+def _build_config_parser(subparsers) -> None:
+    """Register the config subcommand."""
     config_parser = subparsers.add_parser('config', help='Manage configuration')
     config_subparsers = config_parser.add_subparsers(dest='config_command')
 
@@ -119,13 +130,103 @@ Examples:
     config_set_key.add_argument('provider', help='Provider name')
     config_set_key.add_argument('key', help='API key')
 
-    config_show = config_subparsers.add_parser('show', help='Show configuration')
+    config_subparsers.add_parser('show', help='Show configuration')
+
+
+# Subcommand name -> builder. Only the builder for the requested command runs,
+# so e.g. `history list` never pays for constructing the enhance options.
+_SUBPARSER_BUILDERS = {
+    'enhance': _build_enhance_parser,
+    'history': _build_history_parser,
+    'project': _build_project_parser,
+    'providers': _build_providers_parser,
+    'config': _build_config_parser,
+}
+
+
+def _find_command(argv: List[str]) -> Optional[str]:
+    """Return the first non-flag token of argv if it names a known command."""
+    for token in argv:
+        if not token.startswith('-'):
+            return token if token in _SUBPARSER_BUILDERS else None
+    return None
+
+
+# Exact argument vectors of common option-less invocations, mapped to the
+# namespace argparse would produce for them. These skip building a parser
+# entirely; keep them in sync with the _build_*_parser defaults above.
+_FAST_PATH_ARGS = {
+    ('providers',): {'command': 'providers'},
+    ('history', 'list'): {'command': 'history', 'history_command': 'list',
+                          'limit': None, 'query': None, 'provider': None, 'model': None},
+    ('project', 'list'): {'command': 'project', 'project_command': 'list'},
+    ('config', 'show'): {'command': 'config', 'config_command': 'show'},
+}
+
+
+def setup_argparse(argv: Optional[List[str]] = None) -> argparse.ArgumentParser:
+    """
+    Set up argument parser with CLI options.
+
+    Only the subparser for the command found in argv is registered. When no
+    known command is present (no args, top-level --help, typos) every
+    subparser is built so help and error messages list all commands.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Configured argument parser
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description=f"PromptAlchemy v{__version__} - Transform simple prompts into sophisticated LLM prompts",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG
+    )
+
+    parser.add_argument('--version', action='version', version=f'PromptAlchemy v{__version__}')
+
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+
+    command = _find_command(argv)
+    if command:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in _SUBPARSER_BUILDERS.values():
+            build(subparsers)
 
     return parser
 
 
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Invocations listed in _FAST_PATH_ARGS are answered from the table; all
+    others go through the argparse parser.
+
+    Args:
+        argv: Command-line arguments (without the program name)
+
+    Returns:
+        Parsed arguments namespace
+    """
+    fast_args = _FAST_PATH_ARGS.get(tuple(argv))
+    if fast_args is not None:
+        return argparse.Namespace(**fast_args)
+    return setup_argparse(argv).parse_args(argv)
+
+
 def cmd_enhance(args, config: ConfigManager):
     """Handle enhance command."""
+    from core.enhancer import PromptEnhancer
+    from core.history import HistoryManager
+    from core.projects import ProjectManager
+    from core.llm_models import get_provider_models
+
     # Handle auth mode if specified
     if args.auth_mode:
         config.set_auth_mode(args.provider, args.auth_mode)
@@ -161,44 +262,66 @@ def cmd_enhance(args, config: ConfigManager):
     elif args.no_meta_fix:
         meta_fix = False
 
+    if args.batch:
+        prompts = [line.strip() for line in prompt.splitlines() if line.strip()]
+        if not prompts:
+            print("Error: No prompts found in batch input", file=sys.stderr)
+            return 1
+
+    options = dict(
+        role=args.role,
+        reasoning=args.reasoning,
+        verbosity=args.verbosity,
+        tools=args.tools,
+        self_reflect=self_reflect,
+        meta_fix=meta_fix,
+        inputs=args.inputs,
+        deliverables=args.deliverables,
+        attachments=args.attach,
+        temperature=args.temperature,
+        use_cache=not args.no_cache
+    )
+
     # Create enhancer
     enhancer = PromptEnhancer(config)
 
     try:
-        logger.info(f"Enhancing prompt with {args.provider}/{model}...")
+        if args.batch:
+            logger.info(f"Enhancing {len(prompts)} prompts with {args.provider}/{model}...")
+            outcomes = enhancer.enhance_prompts(
+                prompts, args.provider, model, max_concurrency=args.concurrency, **options
+            )
+        else:
+            logger.info(f"Enhancing prompt with {args.provider}/{model}...")
+            outcomes = [enhancer.enhance_prompt(original_prompt=prompt, provider=args.provider, model=model, **options)]
 
-        result = enhancer.enhance_prompt(
-            original_prompt=prompt,
-            provider=args.provider,
-            model=model,
-            role=args.role,
-            reasoning=args.reasoning,
-            verbosity=args.verbosity,
-            tools=args.tools,
-            self_reflect=self_reflect,
-            meta_fix=meta_fix,
-            inputs=args.inputs,
-            deliverables=args.deliverables,
-            attachments=args.attach,
-            temperature=args.temperature
-        )
+        results = []
+        for i, outcome in enumerate(outcomes, start=1):
+            if isinstance(outcome, Exception):
+                logger.error(f"Enhancement failed for prompt {i}: {outcome}")
+            else:
+                results.append(outcome)
 
-        enhanced = result['enhanced_prompt']
+        if not results:
+            return 1
 
         # Output
         if args.output:
-            args.output.write_text(enhanced, encoding='utf-8')
+            separator = "\n\n" + "="*80 + "\n\n"
+            args.output.write_text(separator.join(r['enhanced_prompt'] for r in results), encoding='utf-8')
             logger.info(f"Enhanced prompt saved to {args.output}")
         else:
-            print("\n" + "="*80)
-            print("ENHANCED PROMPT:")
-            print("="*80)
-            print(enhanced)
-            print("="*80 + "\n")
+            for result in results:
+                print("\n" + "="*80)
+                print("ENHANCED PROMPT:")
+                print("="*80)
+                print(result['enhanced_prompt'])
+                print("="*80 + "\n")
 
         # Save to history
         history = HistoryManager(config.get_history_path())
-        history.add_entry(result)
+        for result in results:
+            history.add_entry(result)
 
         # Save to project if specified
         if args.project:
@@ -206,13 +329,15 @@ def cmd_enhance(args, config: ConfigManager):
             project = project_manager.get_project(args.project)
             if not project:
                 project = project_manager.create_project(args.project)
-            project.add_prompt(result)
+            for result in results:
+                project.add_prompt(result)
             logger.info(f"Saved to project: {args.project}")
 
-        if result.get('tokens_used'):
-            logger.info(f"Tokens used: {result['tokens_used']}")
+        tokens_used = sum(r.get('tokens_used') or 0 for r in results)
+        if tokens_used:
+            logger.info(f"Tokens used: {tokens_used}")
 
-        return 0
+        return 0 if len(results) == len(outcomes) else 1
 
     except Exception as e:
         logger.error(f"Enhancement failed: {e}")
@@ -221,6 +346,8 @@ def cmd_enhance(args, config: ConfigManager):
 
 def cmd_history(args, config: ConfigManager):
     """Handle history command."""
+    from core.history import HistoryManager
+
     history = HistoryManager(config.get_history_path())
 
     if args.history_command == 'list':
@@ -237,12 +364,14 @@ def cmd_history(args, config: ConfigManager):
             print("No history entries found.")
             return 0
 
-        print(f"\nFound {len(entries)} entries:\n")
+        # Build the whole listing and write it once
+        lines = [f"\nFound {len(entries)} entries:\n"]
         for i, entry in enumerate(entries):
-            print(f"[{i}] {entry.get('timestamp', 'Unknown')} - {entry.get('provider')}/{entry.get('model')}")
+            lines.append(f"[{i}] {entry.get('timestamp', 'Unknown')} - {entry.get('provider')}/{entry.get('model')}")
             prompt_preview = entry.get('original_prompt', '')[:60].replace('\n', ' ')
-            print(f"    {prompt_preview}...")
-            print()
+            lines.append(f"    {prompt_preview}...")
+            lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     elif args.history_command == 'show':
         entry = history.get_entry_by_index(args.index)
@@ -281,6 +410,8 @@ def cmd_history(args, config: ConfigManager):
 
 def cmd_project(args, config: ConfigManager):
     """Handle project command."""
+    from core.projects import ProjectManager
+
     project_manager = ProjectManager(config.get_projects_dir())
 
     if args.project_command == 'list':
@@ -289,15 +420,17 @@ def cmd_project(args, config: ConfigManager):
             print("No projects found.")
             return 0
 
-        print(f"\nFound {len(projects)} projects:\n")
+        # Build the whole listing and write it once
+        lines = [f"\nFound {len(projects)} projects:\n"]
         for proj in projects:
-            print(f"  {proj['name']}")
+            lines.append(f"  {proj['name']}")
             if proj.get('description'):
-                print(f"    {proj['description']}")
-            print(f"    Created: {proj.get('created', 'Unknown')} | Prompts: {proj.get('prompt_count', 0)}")
+                lines.append(f"    {proj['description']}")
+            lines.append(f"    Created: {proj.get('created', 'Unknown')} | Prompts: {proj.get('prompt_count', 0)}")
             if proj.get('tags'):
-                print(f"    Tags: {', '.join(proj['tags'])}")
-            print()
+                lines.append(f"    Tags: {', '.join(proj['tags'])}")
+            lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     elif args.project_command == 'create':
         try:
@@ -315,16 +448,18 @@ def cmd_project(args, config: ConfigManager):
             logger.error(f"Project '{args.name}' not found")
             return 1
 
-        prompts = project.get_all_prompts()
-        print(f"\nProject: {project.name}")
-        print(f"Description: {project.metadata.get('description', 'N/A')}")
-        print(f"Prompts: {len(prompts)}\n")
-
+        prompts = project.get_all_prompts(limit=args.limit)
+        lines = [
+            f"\nProject: {project.name}",
+            f"Description: {project.metadata.get('description', 'N/A')}",
+            f"Prompts: {project.metadata.get('prompt_count', len(prompts))}\n",
+        ]
         for i, prompt in enumerate(prompts):
-            print(f"[{i}] {prompt.get('timestamp', 'Unknown')}")
+            lines.append(f"[{i}] {prompt.get('timestamp', 'Unknown')}")
             preview = prompt.get('original_prompt', '')[:60].replace('\n', ' ')
-            print(f"    {preview}...")
-            print()
+            lines.append(f"    {preview}...")
+            lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     elif args.project_command == 'export':
         project = project_manager.get_project(args.name)
@@ -335,22 +470,27 @@ def cmd_project(args, config: ConfigManager):
         project.export(args.output)
         logger.info(f"Project exported to {args.output}")
 
+    elif args.project_command == 'compress':
+        project = project_manager.get_project(args.name)
+        if not project:
+            logger.error(f"Project '{args.name}' not found")
+            return 1
+
+        try:
+            project.set_compression(not args.off)
+        except RuntimeError as e:
+            logger.error(str(e))
+            return 1
+        logger.info(f"Compression {'disabled' if args.off else 'enabled'} for project: {args.name}")
+
     return 0
 
 
 def cmd_providers(args, config: ConfigManager):
     """Handle providers command."""
-    print("\nAvailable Providers:\n")
-
-    for provider_id in get_all_provider_ids():
-        display_name = get_provider_display_name(provider_id)
-        models = get_provider_models(provider_id)
-
-        print(f"{display_name} ({provider_id}):")
-        for model in models:
-            print(f"  - {model}")
-        print()
+    from core.llm_models import PROVIDERS_HELP_TEXT
 
+    sys.stdout.write("\nAvailable Providers:\n\n" + PROVIDERS_HELP_TEXT)
     return 0
 
 
@@ -374,6 +514,30 @@ def cmd_config(args, config: ConfigManager):
     return 0
 
 
+# Command name -> handler. Handlers import their own core modules on demand.
+COMMANDS = {
+    'enhance': cmd_enhance,
+    'history': cmd_history,
+    'project': cmd_project,
+    'providers': cmd_providers,
+    'config': cmd_config,
+}
+
+
+# (command, subcommand) pairs whose output is data rather than a report
+_DATA_COMMANDS = frozenset({
+    ('history', 'export'),
+    ('project', 'export'),
+    ('config', 'show'),
+})
+
+
+def _is_data_command(args) -> bool:
+    """Check whether the parsed command produces data output."""
+    subcommand = getattr(args, f"{args.command}_command", None)
+    return (args.command, subcommand) in _DATA_COMMANDS
+
+
 def print_header():
     """Print CLI header with version."""
     print(f"\nPromptAlchemy v{__version__} - LLM Prompt Enhancer")
@@ -382,33 +546,34 @@ def print_header():
 
 def main():
     """Main CLI entry point."""
-    parser = setup_argparse()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+
+    # Answer a bare --version without building any parser
+    if argv == ['--version']:
+        print(f'PromptAlchemy v{__version__}')
+        return 0
+
+    args = parse_args(argv)
 
     if not args.command:
-        parser.print_help()
+        setup_argparse(argv).print_help()
         return 0
 
-    # Print header (except for --version flag)
-    if not hasattr(args, 'version'):
+    # Configure logging only once a command is actually going to run
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    # Print header only for interactive, human-oriented output
+    if sys.stdout.isatty() and not _is_data_command(args):
         print_header()
 
     # Initialize config
     config = ConfigManager()
 
-    # Route to command handlers
-    if args.command == 'enhance':
-        return cmd_enhance(args, config)
-    elif args.command == 'history':
-        return cmd_history(args, config)
-    elif args.command == 'project':
-        return cmd_project(args, config)
-    elif args.command == 'providers':
-        return cmd_providers(args, config)
-    elif args.command == 'config':
-        return cmd_config(args, config)
-
-    return 0
+    # Route to command handler
+    handler = COMMANDS.get(args.command)
+    if handler is None:
+        return 0
+    return handler(args, config)
 
 
 if __name__ == '__main__':
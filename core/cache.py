@@ -0,0 +1,189 @@
+"""
+Response caching for PromptAlchemy.
+
+Stores enhancement results in a small SQLite database so that repeating an
+identical request (same prompt, settings, model and attachments) returns the
+previous result instead of calling the LLM again. Results are also stored
+under a key built from the normalized prompt, so a prompt that differs only
+in case, spacing or trailing punctuation is a "near" hit.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cached results older than this are treated as misses and pruned
+DEFAULT_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Stripped from the end of prompts by normalize_prompt()
+_TRAILING_PUNCTUATION = " .!?;:"
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    Reduce a prompt to a form that ignores case, spacing and trailing punctuation.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Normalized prompt text
+    """
+    return " ".join(text.casefold().split()).rstrip(_TRAILING_PUNCTUATION)
+
+
+def attachments_fingerprint(attachments: Optional[Iterable[Path]]) -> str:
+    """
+    Fingerprint a list of attachments by path, size and modification time.
+
+    Args:
+        attachments: Attachment file paths (may be None)
+
+    Returns:
+        Stable string that changes whenever an attachment changes
+    """
+    if not attachments:
+        return ""
+
+    parts = []
+    for path in attachments:
+        try:
+            stat = Path(path).stat()
+            parts.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return "|".join(parts)
+
+
+class ResponseCache:
+    """Exact-match cache of enhancement results backed by SQLite."""
+
+    def __init__(self, db_path: Path, ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS):
+        """
+        Initialize the response cache.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl_seconds: Maximum age of a usable cache entry
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection for one operation, committing on success.
+
+        A fresh connection per operation lets any thread (e.g. the GUI worker)
+        use the cache.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        context: Dict[str, Any],
+        temperature: float,
+        max_tokens: int,
+        attachments_digest: str = ""
+    ) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            provider: LLM provider
+            model: Model name
+            context: Rendered enhancement settings (including the task)
+            temperature: Model temperature
+            max_tokens: Maximum tokens
+            attachments_digest: Result of attachments_fingerprint()
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            [provider, model, context, f"{temperature:.3f}", max_tokens, attachments_digest],
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=32).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached result dictionary, or None on a miss or expired entry
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT result, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if time.time() - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                return json.loads(row[0])
+        except (sqlite3.Error, json.JSONDecodeError) as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None
+
+    def put(self, key: str, result: Dict[str, Any], extra_keys: Iterable[str] = ()) -> None:
+        """
+        Store a result, pruning expired entries.
+
+        Args:
+            key: Cache key from make_key()
+            result: Enhancement result dictionary
+            extra_keys: Further keys to store the same result under
+        """
+        now = time.time()
+        try:
+            payload = json.dumps(result, ensure_ascii=False)
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO responses (key, result, created_at) VALUES (?, ?, ?)",
+                    [(k, payload, now) for k in dict.fromkeys((key, *extra_keys))]
+                )
+                conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+                )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache response: {e}")
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM responses")
+            logger.info("Response cache cleared")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to clear response cache: {e}")
@@ -1,17 +1,59 @@
 """Configuration management for PromptAlchemy."""
 
+import copy
 import json
 import logging
 import os
 import platform
+import shutil
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
+from . import json_utils
 from .constants import APP_NAME, PROVIDER_KEY_URLS
 from .security import secure_storage
 
 logger = logging.getLogger(__name__)
 
+# Resolved once; the host OS cannot change while the process runs
+_SYSTEM = platform.system()
+
+# Config flag recording that the one-time ImageAI auth import has run
+IMAGEAI_IMPORT_DONE_KEY = "_imageai_import_done"
+
+# Set to 1 to also search Windows AppData for ImageAI config when under WSL
+IMAGEAI_WSL_ENV_VAR = "PROMPTALCHEMY_IMPORT_IMAGEAI"
+
+# Enhancement settings used when the config does not define its own
+_DEFAULT_ENHANCEMENT_DEFAULTS = {
+    "role": "an expert assistant",
+    "reasoning": "Standard",
+    "verbosity": "medium",
+    "tools": ["web", "code"],
+    "self_reflect": True,
+    "meta_fix": True
+}
+
+# Providers whose auth settings (auth mode, gcloud validation) live in config
+GOOGLE_PROVIDERS = frozenset({"gemini", "google"})
+
+
+@lru_cache(maxsize=None)
+def get_config_dir() -> Path:
+    """Get platform-specific configuration directory."""
+    home = Path.home()
+
+    if _SYSTEM == "Windows":
+        base = Path(os.getenv("APPDATA", home / "AppData" / "Roaming"))
+        return base / APP_NAME
+    elif _SYSTEM == "Darwin":  # macOS
+        return home / "Library" / "Application Support" / APP_NAME
+    else:  # Linux/Unix
+        base = Path(os.getenv("XDG_CONFIG_HOME", home / ".config"))
+        return base / APP_NAME
+
 
 class ConfigManager:
     """Manages application configuration and persistence."""
@@ -21,35 +63,39 @@ class ConfigManager:
         self.config_dir = self._get_config_dir()
         self.config_path = self.config_dir / "config.json"
         self.state_path = self.config_dir / "state.json"
+        # Set by _load_config when config.json exists but couldn't be read
+        self._config_unreadable = False
         self.config = self._load_config()
 
-        # Try to import ImageAI auth if available
-        self._import_imageai_auth()
+        # Try to import ImageAI auth if available (only attempted once). Skipped
+        # while config.json is unreadable so its contents aren't overwritten
+        # with defaults.
+        if not self._config_unreadable and not self.config.get(IMAGEAI_IMPORT_DONE_KEY):
+            self._import_imageai_auth()
+            self.config[IMAGEAI_IMPORT_DONE_KEY] = True
+            try:
+                self.save()
+            except Exception:
+                pass  # Already logged by save(); retry on next start
 
     def _get_config_dir(self) -> Path:
         """Get platform-specific configuration directory."""
-        system = platform.system()
-        home = Path.home()
-
-        if system == "Windows":
-            base = Path(os.getenv("APPDATA", home / "AppData" / "Roaming"))
-            return base / APP_NAME
-        elif system == "Darwin":  # macOS
-            return home / "Library" / "Application Support" / APP_NAME
-        else:  # Linux/Unix
-            base = Path(os.getenv("XDG_CONFIG_HOME", home / ".config"))
-            return base / APP_NAME
+        return get_config_dir()
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from disk."""
-        self.config_dir.mkdir(parents=True, exist_ok=True)
+        if not self.config_dir.exists():
+            self.config_dir.mkdir(parents=True, exist_ok=True)
 
-        if self.config_path.exists():
-            try:
-                return json.loads(self.config_path.read_text(encoding="utf-8"))
-            except (OSError, IOError, json.JSONDecodeError):
-                return self._get_default_config()
-        return self._get_default_config()
+        try:
+            return json_utils.loads(self.config_path.read_bytes())
+        except FileNotFoundError:
+            # First run
+            return self._get_default_config()
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load configuration from {self.config_path}, using defaults: {e}")
+            self._config_unreadable = True
+            return self._get_default_config()
 
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration."""
@@ -57,21 +103,11 @@ class ConfigManager:
             "providers": {},
             "default_provider": "openai",
             "default_model": "gpt-4o-mini",
-            "enhancement_defaults": {
-                "role": "an expert assistant",
-                "reasoning": "Standard",
-                "verbosity": "medium",
-                "tools": ["web", "code"],
-                "self_reflect": True,
-                "meta_fix": True
-            }
+            "enhancement_defaults": copy.deepcopy(_DEFAULT_ENHANCEMENT_DEFAULTS)
         }
 
     def _import_imageai_auth(self) -> None:
         """Try to import authentication from ImageAI if available."""
-        import logging
-        logger = logging.getLogger(__name__)
-
         try:
             # Try multiple locations for ImageAI config
             imageai_config_paths = []
@@ -80,9 +116,9 @@ class ConfigManager:
             imageai_config_dir = self._get_config_dir().parent / "ImageAI"
             imageai_config_paths.append(imageai_config_dir / "config.json")
 
-            # 2. Windows AppData location (for WSL cross-platform access)
-            system = platform.system()
-            if system == "Linux" and "microsoft" in platform.uname().release.lower():
+            # 2. Windows AppData location (for WSL cross-platform access, opt-in)
+            if (os.getenv(IMAGEAI_WSL_ENV_VAR) == "1" and _SYSTEM == "Linux"
+                    and "microsoft" in platform.uname().release.lower()):
                 # We're in WSL, check Windows AppData
                 try:
                     import glob
@@ -114,9 +150,6 @@ class ConfigManager:
                 logger.debug("No ImageAI config with data found for import")
                 return
 
-            # Track if we imported anything
-            imported = False
-
             # Import provider API keys from file-based storage if not already present
             providers = imageai_config.get("providers", {})
             for provider, provider_config in providers.items():
@@ -124,7 +157,6 @@ class ConfigManager:
                 if not self.get_api_key(provider):
                     if "api_key" in provider_config and provider_config["api_key"]:
                         self.set_api_key(provider, provider_config["api_key"])
-                        imported = True
 
             # Import Google Cloud auth settings
             if "auth_mode" in imageai_config:
@@ -138,36 +170,30 @@ class ConfigManager:
                         self.config["auth_mode"] = "gcloud"
                     else:
                         self.config["auth_mode"] = auth_mode
-                    imported = True
 
             # Import Google Cloud project ID
             if "gcloud_project_id" in imageai_config:
                 if not self.config.get("gcloud_project_id"):
                     self.config["gcloud_project_id"] = imageai_config["gcloud_project_id"]
-                    imported = True
 
             # Import Google Cloud auth validation status
             if "gcloud_auth_validated" in imageai_config:
                 if not self.config.get("gcloud_auth_validated"):
                     self.config["gcloud_auth_validated"] = imageai_config["gcloud_auth_validated"]
-                    imported = True
-
-            # Save if we imported anything
-            if imported:
-                self.save()
         except Exception as e:
             # Log but don't fail - not critical
-            import logging
-            logging.debug(f"Failed to import ImageAI auth: {e}")
-            pass
+            logger.debug(f"Failed to import ImageAI auth: {e}")
 
     def save(self) -> None:
         """Save current configuration to disk."""
         try:
-            self.config_path.write_text(
-                json.dumps(self.config, indent=2),
-                encoding="utf-8"
-            )
+            if self._config_unreadable and self.config_path.exists():
+                # Keep the file that failed to load instead of replacing it
+                backup_path = self.config_path.with_suffix(".json.bak")
+                shutil.copy2(self.config_path, backup_path)
+                logger.warning(f"Unreadable configuration kept as {backup_path}")
+            self._config_unreadable = False
+            self.config_path.write_bytes(json_utils.dumps(self.config, indent=True))
             logger.debug(f"Configuration saved to {self.config_path}")
         except Exception as e:
             logger.error(f"Failed to save configuration: {e}", exc_info=True)
@@ -194,10 +220,11 @@ class ConfigManager:
 
     def get_api_key(self, provider: str) -> Optional[str]:
         """Get API key for a provider."""
-        # Try keyring first (most secure)
-        key = secure_storage.retrieve_key(provider)
-        if key:
-            return key
+        # Try keyring first (most secure), unless it is known to be unusable
+        if secure_storage.keyring_available:
+            key = secure_storage.retrieve_key(provider)
+            if key:
+                return key
 
         # Check provider-specific config
         provider_config = self.get_provider_config(provider)
@@ -232,7 +259,7 @@ class ConfigManager:
         Returns:
             Authentication mode: 'api-key' or 'gcloud'
         """
-        if provider in ["gemini", "google"]:
+        if provider in GOOGLE_PROVIDERS:
             return self.config.get("auth_mode", "api-key")
         return "api-key"
 
@@ -244,7 +271,7 @@ class ConfigManager:
             provider: Provider name
             mode: Auth mode ('api-key' or 'gcloud')
         """
-        if provider in ["gemini", "google"]:
+        if provider in GOOGLE_PROVIDERS:
             self.config["auth_mode"] = mode
 
     def get_auth_validated(self, provider: str = "gemini") -> bool:
@@ -257,7 +284,7 @@ class ConfigManager:
         Returns:
             True if auth is validated
         """
-        if provider in ["gemini", "google"]:
+        if provider in GOOGLE_PROVIDERS:
             return self.config.get("gcloud_auth_validated", False)
         return False
 
@@ -269,7 +296,7 @@ class ConfigManager:
             provider: Provider name
             validated: Whether auth is validated
         """
-        if provider in ["gemini", "google"]:
+        if provider in GOOGLE_PROVIDERS:
             self.config["gcloud_auth_validated"] = validated
             # Also store the project ID if available
             if validated:
@@ -290,8 +317,8 @@ class ConfigManager:
         self.config["gcloud_project_id"] = project_id
 
     def get_enhancement_defaults(self) -> Dict[str, Any]:
-        """Get default enhancement settings."""
-        return self.config.get("enhancement_defaults", self._get_default_config()["enhancement_defaults"])
+        """Get default enhancement settings (shared; do not modify the result)."""
+        return self.config.get("enhancement_defaults") or _DEFAULT_ENHANCEMENT_DEFAULTS
 
     def set_enhancement_defaults(self, defaults: Dict[str, Any]) -> None:
         """Set default enhancement settings."""
@@ -307,24 +334,29 @@ class ConfigManager:
         """Get path to history file."""
         return self.config_dir / "history.jsonl"
 
+    def get_cache_path(self) -> Path:
+        """Get path to the response cache database."""
+        return self.config_dir / "cache.sqlite"
+
     def save_ui_state(self, state: Dict[str, Any]) -> None:
         """Save UI state."""
-        self.state_path.write_text(
-            json.dumps(state, indent=2),
-            encoding="utf-8"
-        )
+        self.state_path.write_bytes(json_utils.dumps(state, indent=True))
 
     def load_ui_state(self) -> Dict[str, Any]:
         """Load UI state."""
-        if self.state_path.exists():
-            try:
-                return json.loads(self.state_path.read_text(encoding="utf-8"))
-            except (OSError, IOError, json.JSONDecodeError):
-                return {}
-        return {}
+        try:
+            return json_utils.loads(self.state_path.read_bytes())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+
+# Read-only, lowercase-keyed view of PROVIDER_KEY_URLS and its fallback URL
+_PROVIDER_KEY_URLS = MappingProxyType({k.lower(): v for k, v in PROVIDER_KEY_URLS.items()})
+_DEFAULT_KEY_URL = PROVIDER_KEY_URLS["openai"]
 
 
 def get_api_key_url(provider: str) -> str:
     """Get the API key documentation URL for a provider."""
-    provider = (provider or "openai").strip().lower()
-    return PROVIDER_KEY_URLS.get(provider, PROVIDER_KEY_URLS["openai"])
+    if not provider:
+        return _DEFAULT_KEY_URL
+    return _PROVIDER_KEY_URLS.get(provider.strip().lower(), _DEFAULT_KEY_URL)
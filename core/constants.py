@@ -1,5 +1,8 @@
 """Constants for PromptAlchemy application."""
 
+import string
+from typing import Mapping
+
 APP_NAME = "PromptAlchemy"
 APP_VERSION = "1.0.0"
 
@@ -16,33 +19,36 @@ PROVIDER_KEY_URLS = {
 }
 
 # Enhancement modes
-REASONING_MODES = [
+REASONING_MODES = (
     "Standard",
     "Deep Think",
     "Ultra Think",
     "Chain of Thought",
     "Step by Step"
-]
+)
 
-VERBOSITY_LEVELS = [
+VERBOSITY_LEVELS = (
     "minimal",
     "concise",
     "medium",
     "detailed",
     "comprehensive"
-]
+)
 
-TOOL_OPTIONS = [
+TOOL_OPTIONS = (
     "web",
     "code",
     "pdf",
     "image",
     "calculator",
     "file"
-]
+)
+
+# Attachments larger than this are skipped rather than sent to the LLM
+MAX_ATTACHMENT_BYTES = 20 * 1024 * 1024
 
 # Preset roles for prompt enhancement
-DEFAULT_ROLES = [
+DEFAULT_ROLES = (
     # General
     "expert assistant",
     "helpful AI assistant",
@@ -110,7 +116,10 @@ DEFAULT_ROLES = [
     # Legal & Compliance
     "legal advisor",
     "compliance officer"
-]
+)
+
+# For membership checks against the preset roles
+DEFAULT_ROLE_SET = frozenset(DEFAULT_ROLES)
 
 # Default enhancement template
 DEFAULT_ENHANCEMENT_TEMPLATE = """Role: You are a {role}
@@ -127,3 +136,32 @@ Task: {task}
 {inputs}
 
 {deliverables}"""
+
+
+# DEFAULT_ENHANCEMENT_TEMPLATE split once into (literal, field) pairs so each
+# render is a plain join instead of re-parsing the format string. The template
+# uses bare {field} placeholders only (no format specs or conversions).
+_ENHANCEMENT_TEMPLATE_PARTS = tuple(
+    (literal, field) for literal, field, _spec, _conversion
+    in string.Formatter().parse(DEFAULT_ENHANCEMENT_TEMPLATE)
+)
+
+
+def render_enhancement_template(fields: Mapping[str, str]) -> str:
+    """
+    Render DEFAULT_ENHANCEMENT_TEMPLATE.
+
+    Equivalent to DEFAULT_ENHANCEMENT_TEMPLATE.format(**fields).
+
+    Args:
+        fields: String value for every placeholder in the template
+
+    Returns:
+        Rendered enhancement prompt
+    """
+    parts = []
+    for literal, field in _ENHANCEMENT_TEMPLATE_PARTS:
+        parts.append(literal)
+        if field is not None:
+            parts.append(fields[field])
+    return "".join(parts)
@@ -1,25 +1,63 @@
 """Prompt enhancement engine using litellm."""
 
+import asyncio
+import copy
 import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-import mimetypes
 import base64
 from pathlib import Path
 
 try:
     import litellm
+    import httpx  # Installed with litellm
     LITELLM_AVAILABLE = True
 except ImportError:
     LITELLM_AVAILABLE = False
 
+from . import mime
 from .llm_models import format_model_name, get_provider_config
+from .cache import ResponseCache, attachments_fingerprint, normalize_prompt
 from .config import ConfigManager
-from .constants import DEFAULT_ENHANCEMENT_TEMPLATE
+from .constants import MAX_ATTACHMENT_BYTES, render_enhancement_template
 from .logging_config import log_exception, log_api_call
 
 logger = logging.getLogger(__name__)
 
+# Connection pool settings shared by the sync and async HTTP sessions
+_HTTP_MAX_KEEPALIVE_CONNECTIONS = 16
+_HTTP_MAX_CONNECTIONS = 32
+_HTTP_TIMEOUT_SECONDS = 60.0
+
+# Base64-encode attachments in chunks; a multiple of 3 bytes so chunks concatenate cleanly
+_BASE64_CHUNK_BYTES = 57 * 1024
+
+# Encoded attachment content parts, keyed by (path, mtime_ns, size), least recently used first
+_ATTACHMENT_CACHE_MAX_ENTRIES = 32
+_ATTACHMENT_CACHE_MAX_BYTES = 128 * 1024 * 1024
+_attachment_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_attachment_cache_bytes = 0
+_attachment_cache_lock = threading.Lock()
+
+
+@dataclass
+class _EnhanceRequest:
+    """A resolved enhancement request, ready to send to litellm."""
+    original_prompt: str
+    provider: str
+    model: str
+    context: Dict[str, str]
+    temperature: float = 0.7
+    auth_mode: str = "api-key"
+    completion_kwargs: Dict[str, Any] = field(default_factory=dict)
+    cache_key: Optional[str] = None
+    near_cache_key: Optional[str] = None
+    cached: Optional[Dict[str, Any]] = None
+
 
 class PromptEnhancer:
     """Main prompt enhancement engine."""
@@ -35,11 +73,33 @@ class PromptEnhancer:
             raise ImportError("litellm is required. Install with: pip install litellm")
 
         self.config = config_manager
+        self.cache = ResponseCache(self.config.get_cache_path())
+
+        # Cache key -> future of the identical async request already in flight
+        self._pending: Dict[str, asyncio.Future] = {}
 
         # Enable dropping of unsupported parameters (required for GPT-5 and other models)
         litellm.drop_params = True
         logger.info("LiteLLM configured with drop_params=True for compatibility")
 
+        # Share one pooled HTTP session across calls so connections (and TLS
+        # sessions) stay alive between enhancements. httpx pools per host, so
+        # each provider keeps its own warm connections within the session.
+        self._owns_client_session = getattr(litellm, "client_session", None) is None
+        if self._owns_client_session:
+            litellm.client_session = httpx.Client(limits=self._http_limits(), timeout=_HTTP_TIMEOUT_SECONDS)
+
+        # Async counterpart for litellm.acompletion, installed by
+        # _ensure_async_session for the event loop it is used on
+        self._async_session: Optional["httpx.AsyncClient"] = None
+        self._async_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Warm up Google Cloud auth in the background so the first
+        # enhancement doesn't wait on the gcloud CLI
+        if self.config.get_auth_mode("gemini") == "gcloud":
+            from .gcloud_utils import start_auth_refresher
+            start_auth_refresher()
+
     def enhance_prompt(
         self,
         original_prompt: str,
@@ -55,7 +115,8 @@ class PromptEnhancer:
         deliverables: Optional[str] = None,
         attachments: Optional[List[Path]] = None,
         temperature: float = 0.7,
-        max_tokens: int = 4096
+        max_tokens: int = 4096,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Enhance a prompt using the specified LLM.
@@ -75,9 +136,226 @@ class PromptEnhancer:
             attachments: List of file paths to attach
             temperature: Model temperature
             max_tokens: Maximum tokens
+            use_cache: Return a cached result for an identical earlier request
+                (only applies at temperature 0)
+
+        Returns:
+            Dictionary with enhanced prompt and metadata. Results served from
+            the response cache carry ``cache_hit: "exact"``, or ``"near"`` if
+            an earlier prompt differed only in case, spacing or trailing
+            punctuation.
+        """
+        request = self._prepare_request(
+            original_prompt, provider, model, role, reasoning, verbosity, tools,
+            self_reflect, meta_fix, inputs, deliverables, attachments,
+            temperature, max_tokens, use_cache
+        )
+        if request.cached is not None:
+            return request.cached
+
+        start_ns = time.perf_counter_ns()
+        try:
+            self._log_request(request)
+            response = litellm.completion(**request.completion_kwargs)
+            return self._finish_request(request, response, start_ns)
+        except Exception as e:
+            self._log_failure(request, e, start_ns)
+            raise
+
+    async def aenhance_prompt(
+        self,
+        original_prompt: str,
+        provider: str,
+        model: str,
+        role: Optional[str] = None,
+        reasoning: Optional[str] = None,
+        verbosity: Optional[str] = None,
+        tools: Optional[List[str]] = None,
+        self_reflect: Optional[bool] = None,
+        meta_fix: Optional[bool] = None,
+        inputs: Optional[str] = None,
+        deliverables: Optional[str] = None,
+        attachments: Optional[List[Path]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Enhance a prompt without blocking the event loop.
+
+        Asynchronous counterpart of enhance_prompt() using litellm.acompletion;
+        takes the same arguments and returns the same result dictionary.
+        An identical request already in flight on the same event loop is
+        joined instead of being sent again.
+        """
+        request = self._prepare_request(
+            original_prompt, provider, model, role, reasoning, verbosity, tools,
+            self_reflect, meta_fix, inputs, deliverables, attachments,
+            temperature, max_tokens, use_cache
+        )
+        if request.cached is not None:
+            return request.cached
+
+        key = request.cache_key
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(key) if key else None
+        if pending is not None and pending.get_loop() is loop:
+            logger.info(f"Joining identical in-flight request to {provider}/{model}")
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        future = loop.create_future() if key else None
+        if future is not None:
+            self._pending[key] = future
+
+        start_ns = time.perf_counter_ns()
+        try:
+            self._ensure_async_session()
+            self._log_request(request)
+            response = await litellm.acompletion(**request.completion_kwargs)
+            result = self._finish_request(request, response, start_ns)
+            if future is not None:
+                future.set_result(copy.deepcopy(result))
+            return result
+        except BaseException as e:
+            if future is not None:
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    # Joined requests re-raise it; don't warn if there were none
+                    future.exception()
+            if isinstance(e, Exception):
+                self._log_failure(request, e, start_ns)
+            raise
+        finally:
+            if future is not None and self._pending.get(key) is future:
+                del self._pending[key]
+
+    def enhance_prompts(
+        self,
+        prompts: List[str],
+        provider: str,
+        model: str,
+        max_concurrency: int = 4,
+        **options: Any
+    ) -> List[Any]:
+        """
+        Enhance several prompts with the same settings concurrently.
+
+        Args:
+            prompts: Original prompts to enhance
+            provider: LLM provider
+            model: Model name
+            max_concurrency: Maximum number of requests in flight at once
+            **options: Any other enhance_prompt() keyword arguments
+
+        Returns:
+            One entry per prompt, in input order: the result dictionary, or the
+            exception raised for that prompt
+        """
+        return asyncio.run(self.aenhance_prompts(prompts, provider, model, max_concurrency, **options))
+
+    async def aenhance_prompts(
+        self,
+        prompts: List[str],
+        provider: str,
+        model: str,
+        max_concurrency: int = 4,
+        **options: Any
+    ) -> List[Any]:
+        """Asynchronous counterpart of enhance_prompts()."""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def enhance_one(prompt: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aenhance_prompt(prompt, provider, model, **options)
+
+        # Identical prompts in one batch are only sent once
+        unique_prompts = list(dict.fromkeys(prompts))
+        outcomes = await asyncio.gather(
+            *(enhance_one(prompt) for prompt in unique_prompts),
+            return_exceptions=True
+        )
+        by_prompt = dict(zip(unique_prompts, outcomes))
+        return [by_prompt[prompt] for prompt in prompts]
+
+    @staticmethod
+    def _http_limits() -> "httpx.Limits":
+        """Connection pool limits for the shared HTTP sessions."""
+        return httpx.Limits(
+            max_keepalive_connections=_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=_HTTP_MAX_CONNECTIONS
+        )
+
+    def _ensure_async_session(self) -> None:
+        """Share one pooled async HTTP session across calls on the running loop."""
+        current = getattr(litellm, "aclient_session", None)
+        if current is not None and current is not self._async_session:
+            # Installed by someone else; leave it alone
+            return
+
+        # Async connections belong to the loop that opened them, so a new
+        # loop (e.g. another asyncio.run) needs its own session
+        loop = asyncio.get_running_loop()
+        if current is not None and self._async_session_loop is loop:
+            return
+
+        self._async_session = httpx.AsyncClient(limits=self._http_limits(), timeout=_HTTP_TIMEOUT_SECONDS)
+        self._async_session_loop = loop
+        litellm.aclient_session = self._async_session
+
+    def close(self) -> None:
+        """
+        Close the pooled HTTP sessions this enhancer created.
+
+        Call from outside the event loop the async session was used on; if
+        that loop is no longer running the session is just dropped.
+        """
+        if self._owns_client_session:
+            session = getattr(litellm, "client_session", None)
+            litellm.client_session = None
+            self._owns_client_session = False
+            if session is not None:
+                try:
+                    session.close()
+                except Exception as e:
+                    logger.debug(f"Failed to close HTTP session: {e}")
+
+        async_session, loop = self._async_session, self._async_session_loop
+        self._async_session = self._async_session_loop = None
+        if async_session is None:
+            return
+        if getattr(litellm, "aclient_session", None) is async_session:
+            litellm.aclient_session = None
+        if loop is not None and loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(async_session.aclose(), loop).result(timeout=2)
+            except Exception as e:
+                logger.debug(f"Failed to close async HTTP session: {e}")
+
+    def _resolve_request(
+        self,
+        original_prompt: str,
+        provider: str,
+        model: str,
+        role: Optional[str],
+        reasoning: Optional[str],
+        verbosity: Optional[str],
+        tools: Optional[List[str]],
+        self_reflect: Optional[bool],
+        meta_fix: Optional[bool],
+        inputs: Optional[str],
+        deliverables: Optional[str],
+        attachments: Optional[List[Path]],
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool
+    ) -> _EnhanceRequest:
+        """
+        Resolve settings and look the request up in the response cache.
 
         Returns:
-            Dictionary with enhanced prompt and metadata
+            Request with its context resolved; its ``cached`` field is set on a cache hit
         """
         # Get defaults
         defaults = self.config.get_enhancement_defaults()
@@ -95,8 +373,85 @@ class PromptEnhancer:
             "deliverables": f"\nDeliverables:\n{deliverables}" if deliverables else ""
         }
 
+        request = _EnhanceRequest(
+            original_prompt=original_prompt,
+            provider=provider,
+            model=model,
+            context=context,
+            temperature=temperature
+        )
+
+        # Handle special model requirements
+        # GPT-5 models only support temperature=1.0
+        if 'gpt-5' in model.lower():
+            logger.info(f"GPT-5 model detected, forcing temperature=1.0 (only supported value)")
+            request.temperature = 1.0
+
+        # Serve identical (or near-identical) earlier requests from the response
+        # cache. Only deterministic (temperature 0) requests are cached: at any
+        # other temperature, asking again is how users get a different variant.
+        if use_cache and request.temperature == 0:
+            attachments_digest = attachments_fingerprint(attachments)
+            request.cache_key = ResponseCache.make_key(
+                provider, model, context, request.temperature, max_tokens, attachments_digest
+            )
+            request.near_cache_key = ResponseCache.make_key(
+                provider, model, dict(context, task=normalize_prompt(original_prompt)),
+                request.temperature, max_tokens, attachments_digest
+            )
+
+            cached = self.cache.get(request.cache_key)
+            if not cached and request.near_cache_key != request.cache_key:
+                cached = self.cache.get(request.near_cache_key)
+            if cached:
+                cache_hit = "exact" if cached.get("original_prompt") == original_prompt else "near"
+                logger.info(f"Using cached enhancement for {provider}/{model} ({cache_hit} match)")
+                cached.update(
+                    original_prompt=original_prompt,
+                    settings=context,
+                    timestamp=datetime.now().isoformat(),
+                    tokens_used=0,
+                    duration_seconds=0.0,
+                    cache_hit=cache_hit
+                )
+                request.cached = cached
+
+        return request
+
+    def _prepare_request(
+        self,
+        original_prompt: str,
+        provider: str,
+        model: str,
+        role: Optional[str],
+        reasoning: Optional[str],
+        verbosity: Optional[str],
+        tools: Optional[List[str]],
+        self_reflect: Optional[bool],
+        meta_fix: Optional[bool],
+        inputs: Optional[str],
+        deliverables: Optional[str],
+        attachments: Optional[List[Path]],
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool
+    ) -> _EnhanceRequest:
+        """
+        Resolve settings, check the cache and authentication, and build the LLM call.
+
+        Returns:
+            Prepared request; its ``cached`` field is set on a cache hit
+        """
+        request = self._resolve_request(
+            original_prompt, provider, model, role, reasoning, verbosity, tools,
+            self_reflect, meta_fix, inputs, deliverables, attachments,
+            temperature, max_tokens, use_cache
+        )
+        if request.cached is not None:
+            return request
+
         # Build the enhancement prompt
-        enhancement_prompt = DEFAULT_ENHANCEMENT_TEMPLATE.format(**context)
+        enhancement_prompt = render_enhancement_template(request.context)
 
         # Prepare messages
         messages = [
@@ -115,15 +470,15 @@ class PromptEnhancer:
             messages = self._add_attachments(messages, attachments)
 
         # Check authentication mode
-        auth_mode = self.config.get_auth_mode(provider)
+        request.auth_mode = self.config.get_auth_mode(provider)
 
         # Get API key (not needed for cloud auth)
         api_key = None
-        if auth_mode == "api-key":
+        if request.auth_mode == "api-key":
             api_key = self.config.get_api_key(provider)
             if not api_key and get_provider_config(provider).requires_api_key:
                 raise ValueError(f"API key for {provider} not configured")
-        elif auth_mode == "gcloud":
+        elif request.auth_mode == "gcloud":
             # For Google Cloud auth, ensure gcloud is authenticated
             from .gcloud_utils import check_gcloud_auth_status
             is_authed, status_msg = check_gcloud_auth_status()
@@ -132,76 +487,63 @@ class PromptEnhancer:
             logger.info("Using Google Cloud Application Default Credentials")
 
         # Format model name with provider prefix
-        full_model_name = format_model_name(provider, model)
-
-        # Set API key if required (not for cloud auth)
-        if api_key:
-            litellm.api_key = api_key
-
-        # Handle special model requirements
-        # GPT-5 models only support temperature=1.0
-        if 'gpt-5' in model.lower():
-            logger.info(f"GPT-5 model detected, forcing temperature=1.0 (only supported value)")
-            temperature = 1.0
-
-        # Call LLM
-        start_time = datetime.now()
-        try:
-            logger.info(f"Calling {full_model_name} to enhance prompt")
-            logger.debug(f"Auth mode: {auth_mode}, Temperature: {temperature}, Max tokens: {max_tokens}")
-            logger.debug(f"Original prompt length: {len(original_prompt)} chars")
-
-            # For gcloud auth, let litellm use ADC by not passing api_key
-            if auth_mode == "gcloud":
-                logger.debug("Using Google Cloud Application Default Credentials")
-                response = litellm.completion(
-                    model=full_model_name,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
-            else:
-                logger.debug(f"Using API key authentication for {provider}")
-                response = litellm.completion(
-                    model=full_model_name,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    api_key=api_key
-                )
-
-            enhanced_prompt = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens if hasattr(response, 'usage') else None
-            duration = (datetime.now() - start_time).total_seconds()
-
-            # Log successful API call
-            log_api_call(logger, provider, model, True, tokens=tokens_used)
-            logger.info(f"Enhancement completed in {duration:.2f}s, tokens: {tokens_used}")
-            logger.debug(f"Enhanced prompt length: {len(enhanced_prompt)} chars")
-
-            result = {
-                "original_prompt": original_prompt,
-                "enhanced_prompt": enhanced_prompt,
-                "provider": provider,
-                "model": model,
-                "settings": context,
-                "timestamp": datetime.now().isoformat(),
-                "tokens_used": tokens_used,
-                "duration_seconds": duration
-            }
+        request.completion_kwargs = {
+            "model": format_model_name(provider, model),
+            "messages": messages,
+            "temperature": request.temperature,
+            "max_tokens": max_tokens
+        }
 
-            return result
+        # For gcloud auth, let litellm use ADC by not passing api_key
+        if request.auth_mode != "gcloud":
+            request.completion_kwargs["api_key"] = api_key
+
+        return request
+
+    def _log_request(self, request: _EnhanceRequest) -> None:
+        """Log an outgoing LLM call."""
+        kwargs = request.completion_kwargs
+        logger.info(f"Calling {kwargs['model']} to enhance prompt")
+        logger.debug(f"Auth mode: {request.auth_mode}, Temperature: {kwargs['temperature']}, Max tokens: {kwargs['max_tokens']}")
+        logger.debug(f"Original prompt length: {len(request.original_prompt)} chars")
+        if request.auth_mode == "gcloud":
+            logger.debug("Using Google Cloud Application Default Credentials")
+        else:
+            logger.debug(f"Using API key authentication for {request.provider}")
+
+    def _finish_request(self, request: _EnhanceRequest, response: Any, start_ns: int) -> Dict[str, Any]:
+        """Build the result dictionary from an LLM response and cache it."""
+        enhanced_prompt = response.choices[0].message.content
+        tokens_used = response.usage.total_tokens if hasattr(response, 'usage') else None
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
+
+        # Log successful API call
+        log_api_call(logger, request.provider, request.model, True, tokens=tokens_used)
+        logger.info(f"Enhancement completed in {duration:.2f}s, tokens: {tokens_used}")
+        logger.debug(f"Enhanced prompt length: {len(enhanced_prompt)} chars")
+
+        result = {
+            "original_prompt": request.original_prompt,
+            "enhanced_prompt": enhanced_prompt,
+            "provider": request.provider,
+            "model": request.model,
+            "settings": request.context,
+            "timestamp": datetime.now().isoformat(),
+            "tokens_used": tokens_used,
+            "duration_seconds": duration
+        }
 
-        except Exception as e:
-            duration = (datetime.now() - start_time).total_seconds()
-            error_msg = str(e)
+        if request.cache_key:
+            self.cache.put(request.cache_key, result, extra_keys=(request.near_cache_key,))
 
-            # Log failed API call
-            log_api_call(logger, provider, model, False, error=error_msg)
-            log_exception(logger, e, "enhance_prompt")
-            logger.error(f"Enhancement failed after {duration:.2f}s")
+        return result
 
-            raise
+    def _log_failure(self, request: _EnhanceRequest, error: Exception, start_ns: int) -> None:
+        """Log a failed LLM call."""
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
+        log_api_call(logger, request.provider, request.model, False, error=str(error))
+        log_exception(logger, error, "enhance_prompt")
+        logger.error(f"Enhancement failed after {duration:.2f}s")
 
     def _add_attachments(self, messages: List[Dict], attachments: List[Path]) -> List[Dict]:
         """
@@ -214,6 +556,9 @@ class PromptEnhancer:
         Returns:
             Updated messages with attachments
         """
+        if not attachments:
+            return messages
+
         # Build content list for the user message
         content_parts = []
 
@@ -225,51 +570,126 @@ class PromptEnhancer:
             })
 
         # Add attachments
+        added = 0
         for attachment_path in attachments:
-            if not attachment_path.exists():
-                logger.warning(f"Attachment not found: {attachment_path}")
-                continue
-
-            mime_type, _ = mimetypes.guess_type(str(attachment_path))
-            if not mime_type:
-                mime_type = "application/octet-stream"
-
             # Read file
             try:
-                with open(attachment_path, "rb") as f:
-                    file_data = f.read()
-
-                # For text files, include as text
-                if mime_type.startswith("text/"):
-                    content_parts.append({
-                        "type": "text",
-                        "text": f"\n\n--- File: {attachment_path.name} ---\n{file_data.decode('utf-8', errors='ignore')}\n--- End of file ---\n"
-                    })
-                # For images, include as image
-                elif mime_type.startswith("image/"):
-                    base64_data = base64.b64encode(file_data).decode('utf-8')
-                    content_parts.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:{mime_type};base64,{base64_data}"
-                        }
-                    })
-                # For other files, include summary
-                else:
-                    content_parts.append({
-                        "type": "text",
-                        "text": f"\n\n[Attached file: {attachment_path.name}, type: {mime_type}, size: {len(file_data)} bytes]\n"
-                    })
+                stat = attachment_path.stat()
+                if stat.st_size > MAX_ATTACHMENT_BYTES:
+                    logger.warning(
+                        f"Skipping attachment {attachment_path}: {stat.st_size} bytes exceeds "
+                        f"the {MAX_ATTACHMENT_BYTES} byte limit"
+                    )
+                    continue
+
+                mime_type = mime.guess(attachment_path)
+                content_parts.append(
+                    self._cached_attachment_part(attachment_path, mime_type, stat.st_mtime_ns, stat.st_size)
+                )
+                added += 1
 
+            except FileNotFoundError:
+                logger.warning(f"Attachment not found: {attachment_path}")
+                continue
             except Exception as e:
                 logger.warning(f"Failed to read attachment {attachment_path}: {e}")
                 continue
 
+        # Leave the message untouched if no attachment could be added
+        if not added:
+            return messages
+
         # Update the last message
-        if content_parts:
-            messages[-1] = {
-                "role": "user",
-                "content": content_parts if len(content_parts) > 1 else content_parts[0]["text"]
-            }
+        messages[-1] = {
+            "role": "user",
+            "content": content_parts if len(content_parts) > 1 else content_parts[0]["text"]
+        }
 
         return messages
+
+    def _cached_attachment_part(
+        self,
+        attachment_path: Path,
+        mime_type: str,
+        mtime_ns: int,
+        file_size: int
+    ) -> Dict[str, Any]:
+        """
+        Get the content part for an attachment, reusing a previous encoding
+        if the file hasn't changed.
+
+        Args:
+            attachment_path: Attachment file path
+            mime_type: MIME type of the attachment
+            mtime_ns: File modification time in nanoseconds
+            file_size: File size in bytes
+
+        Returns:
+            Message content part dictionary
+        """
+        global _attachment_cache_bytes
+        key = (str(attachment_path), mime_type, mtime_ns, file_size)
+
+        with _attachment_cache_lock:
+            cached = _attachment_cache.get(key)
+            if cached is not None:
+                _attachment_cache.move_to_end(key)
+                return copy.deepcopy(cached[0])
+
+        part = self._attachment_part(attachment_path, mime_type, file_size)
+        part_bytes = len(part.get("text") or part.get("image_url", {}).get("url", ""))
+
+        with _attachment_cache_lock:
+            if key not in _attachment_cache:
+                _attachment_cache[key] = (part, part_bytes)
+                _attachment_cache_bytes += part_bytes
+            while _attachment_cache and (
+                len(_attachment_cache) > _ATTACHMENT_CACHE_MAX_ENTRIES
+                or _attachment_cache_bytes > _ATTACHMENT_CACHE_MAX_BYTES
+            ):
+                _, (_, evicted_bytes) = _attachment_cache.popitem(last=False)
+                _attachment_cache_bytes -= evicted_bytes
+
+        return copy.deepcopy(part)
+
+    @staticmethod
+    def _attachment_part(attachment_path: Path, mime_type: str, file_size: int) -> Dict[str, Any]:
+        """
+        Read an attachment and build its message content part.
+
+        Args:
+            attachment_path: Attachment file path
+            mime_type: MIME type of the attachment
+            file_size: File size in bytes
+
+        Returns:
+            Message content part dictionary
+        """
+        # For text files, include as text
+        if mime.is_text(mime_type):
+            with open(attachment_path, "r", encoding="utf-8", errors="ignore", newline="") as f:
+                text = f.read()
+            return {
+                "type": "text",
+                "text": f"\n\n--- File: {attachment_path.name} ---\n{text}\n--- End of file ---\n"
+            }
+
+        # For images, include as image
+        if mime_type.startswith("image/"):
+            encoded = bytearray()
+            with open(attachment_path, "rb") as f:
+                while chunk := f.read(_BASE64_CHUNK_BYTES):
+                    encoded += base64.b64encode(chunk)
+            base64_data = encoded.decode("ascii")
+            return {
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:{mime_type};base64,{base64_data}"
+                }
+            }
+
+        # For other files, include summary
+        return {
+            "type": "text",
+            "text": f"\n\n[Attached file: {attachment_path.name}, type: {mime_type}, size: {file_size} bytes]\n"
+        }
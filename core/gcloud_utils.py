@@ -1,8 +1,13 @@
 """Google Cloud authentication utilities."""
 
+import glob
 import subprocess
 import platform
 import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional, Tuple
 from pathlib import Path
 
@@ -18,7 +23,22 @@ except ImportError:
     DefaultCredentialsError = Exception
     GCLOUD_AVAILABLE = False
 
+# How long a successful authentication check is trusted
+AUTH_CACHE_TTL_SECONDS = 300
 
+# (monotonic time, is_authenticated, status_message) of the last successful check
+_auth_cache: Optional[Tuple[float, bool, str]] = None
+
+# Serializes checks so concurrent callers wait for one in-flight check
+_auth_lock = threading.Lock()
+_refresher_thread: Optional[threading.Thread] = None
+
+# Application Default Credentials, kept so their token is only refreshed near expiry
+_adc_credentials = None
+_adc_project_id: Optional[str] = None
+
+
+@lru_cache(maxsize=1)
 def find_gcloud_command() -> Optional[str]:
     """Find the gcloud command on various platforms."""
     system = platform.system()
@@ -70,11 +90,9 @@ def find_gcloud_command() -> Optional[str]:
             "/mnt/c/Program Files (x86)/Google/Cloud SDK/google-cloud-sdk/bin/gcloud.cmd",
         ]
         # Also check user directories
-        if os.path.exists("/mnt/c/Users/"):
-            for user_dir in os.listdir("/mnt/c/Users/"):
-                user_gcloud = f"/mnt/c/Users/{user_dir}/AppData/Local/Google/Cloud SDK/google-cloud-sdk/bin/gcloud.cmd"
-                if os.path.exists(user_gcloud):
-                    wsl_paths.append(user_gcloud)
+        wsl_paths.extend(sorted(glob.glob(
+            "/mnt/c/Users/*/AppData/Local/Google/Cloud SDK/google-cloud-sdk/bin/gcloud.cmd"
+        )))
 
         for path in wsl_paths:
             if os.path.exists(path):
@@ -122,14 +140,103 @@ def get_gcloud_project_id() -> Optional[str]:
     return None
 
 
-def check_gcloud_auth_status() -> Tuple[bool, str]:
-    """Check if gcloud is authenticated. Returns (is_authenticated, status_message)."""
+def _adc_token_available() -> bool:
+    """
+    Check Application Default Credentials in-process.
+
+    The credentials object is kept between calls and its access token is only
+    refreshed when it is missing or about to expire, so repeated checks don't
+    spawn gcloud.
+    """
+    global _adc_credentials, _adc_project_id
+    try:
+        from google.auth.transport.requests import Request
+
+        if _adc_credentials is None:
+            _adc_credentials, _adc_project_id = google_auth_default(
+                scopes=["https://www.googleapis.com/auth/cloud-platform"]
+            )
+
+        # google-auth stores expiry as a naive UTC datetime
+        expiry = _adc_credentials.expiry
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if not _adc_credentials.token or expiry is None or expiry - now < timedelta(seconds=60):
+            _adc_credentials.refresh(Request())
+        return bool(_adc_credentials.token)
+    except Exception:
+        _adc_credentials = None
+        _adc_project_id = None
+        return False
+
+
+def check_gcloud_auth_status(use_cache: bool = True) -> Tuple[bool, str]:
+    """
+    Check if gcloud is authenticated.
+
+    Successful results are reused for AUTH_CACHE_TTL_SECONDS; failures are
+    always re-checked.
+
+    Args:
+        use_cache: Reuse a recent successful result instead of checking again
+
+    Returns:
+        Tuple of (is_authenticated, status_message)
+    """
+    global _auth_cache
+    with _auth_lock:
+        if use_cache and _auth_cache and time.monotonic() - _auth_cache[0] < AUTH_CACHE_TTL_SECONDS:
+            return _auth_cache[1], _auth_cache[2]
+
+        is_authed, status_msg = _check_gcloud_auth()
+        _auth_cache = (time.monotonic(), is_authed, status_msg) if is_authed else None
+        return is_authed, status_msg
+
+
+def start_auth_refresher() -> None:
+    """
+    Check gcloud authentication in a background thread and keep it fresh.
+
+    The thread re-checks shortly before each cached result expires (which
+    also refreshes the ADC token when it nears expiry), so enhancements find
+    a valid cached result instead of waiting on gcloud. It stops once a
+    check fails; the next enhancement then reports the problem itself.
+    """
+    global _refresher_thread
+    if not GCLOUD_AVAILABLE:
+        return
+    if _refresher_thread is not None and _refresher_thread.is_alive():
+        return
+    _refresher_thread = threading.Thread(
+        target=_auth_refresh_loop, name="gcloud-auth-refresh", daemon=True
+    )
+    _refresher_thread.start()
+
+
+def _auth_refresh_loop() -> None:
+    """Body of the background refresher thread."""
+    while True:
+        is_authed, _ = check_gcloud_auth_status(use_cache=False)
+        if not is_authed:
+            return
+        time.sleep(AUTH_CACHE_TTL_SECONDS * 0.9)
+
+
+def _check_gcloud_auth() -> Tuple[bool, str]:
+    """Check gcloud authentication without caching. Returns (is_authenticated, status_message)."""
     if not GCLOUD_AVAILABLE:
         return False, "Google Cloud AI Platform library not installed. Run: pip install google-cloud-aiplatform"
 
+    if _adc_token_available():
+        project_id = _adc_project_id or get_gcloud_project_id()
+        if project_id:
+            return True, f"Authenticated with Google Cloud (Project: {project_id})"
+        return True, "Authenticated with Google Cloud (No project set)"
+
     try:
         gcloud_cmd = find_gcloud_command()
         if not gcloud_cmd:
+            # Look again next time in case gcloud gets installed meanwhile
+            find_gcloud_command.cache_clear()
             system = platform.system()
             if system == "Windows":
                 return False, ("Google Cloud CLI not found. Please:\n"
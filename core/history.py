@@ -1,13 +1,52 @@
 """History management for PromptAlchemy."""
 
+import atexit
 import json
 import logging
+import os
+import queue
+import struct
+import threading
+import weakref
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from . import json_utils
+from .history_index import HistoryIndex, file_fingerprint
+
 logger = logging.getLogger(__name__)
 
+# The offsets file holds the byte offset of every valid history line, in the
+# order get_all_entries() sorts them (by timestamp, oldest first), followed
+# by one record giving the history file size the offsets cover
+_OFFSET = struct.Struct("<Q")
+
+# Entries serialized per write when exporting JSONL
+_EXPORT_BATCH_SIZE = 1000
+
+# Appends up to this size are a single atomic write; larger ones take a file lock
+_ATOMIC_APPEND_BYTES = 4096
+
+# Most queued entries the background writer combines into one write
+_WRITE_BATCH_SIZE = 100
+
+# Managers that have written in the background; held weakly so that
+# discarded managers can still be closed and collected
+_managers_to_flush: "weakref.WeakSet[HistoryManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all() -> None:
+    """Write out the entries still queued by any manager before exiting."""
+    for manager in list(_managers_to_flush):
+        manager.flush()
+
 
 class HistoryManager:
     """Manages enhancement history."""
@@ -22,25 +61,183 @@ class HistoryManager:
         self.history_path = history_path
         self.history_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Parsed entries in file order (oldest first), refreshed incrementally
+        self._cache: List[Dict[str, Any]] = []
+        self._cache_mtime_ns = 0
+        self._cache_bytes_read = 0
+        self._cache_fingerprint: Optional[int] = None
+        # Serializes cache refreshes and index syncs, since searches may run
+        # on a worker thread while the GUI thread reads history too
+        self._read_lock = threading.RLock()
+
+        # Full-text index used for text searches
+        self.index = HistoryIndex(history_path.with_suffix(".db"), history_path)
+
+        # Byte offset of every line, oldest first, for direct lookups by index
+        self.offsets_path = history_path.with_suffix(".idx")
+
+        # Append-only descriptor for the history file, opened on first write
+        self._fd: Optional[int] = None
+
+        # Entries waiting for the background writer, which runs only while
+        # there is something to write
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    def __del__(self):
+        self.close()
+
+    def close(self) -> None:
+        """Close the history file descriptor, if open."""
+        if getattr(self, "_fd", None) is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _append(self, payload: bytes) -> int:
+        """
+        Append bytes to the history file without interleaving with other writers.
+
+        Args:
+            payload: Complete line(s) to append
+
+        Returns:
+            Byte offset at which the payload was written
+        """
+        # Reopen if the file was deleted (e.g. history cleared by another process)
+        if self._fd is not None and os.fstat(self._fd).st_nlink == 0:
+            self.close()
+        if self._fd is None:
+            flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+            self._fd = os.open(self.history_path, flags, 0o644)
+
+        locked = fcntl is not None and len(payload) > _ATOMIC_APPEND_BYTES
+        if locked:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(self._fd, view):]
+            return os.lseek(self._fd, 0, os.SEEK_CUR) - len(payload)
+        finally:
+            if locked:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
     def add_entry(self, entry: Dict[str, Any]) -> None:
         """
         Add an entry to history.
 
+        The entry is written by a background thread so the caller doesn't
+        wait on the disk. Reads through this manager see it immediately.
+
         Args:
             entry: Enhancement entry dictionary
         """
-        try:
-            # Ensure timestamp
-            if "timestamp" not in entry:
-                entry["timestamp"] = datetime.now().isoformat()
+        # Ensure timestamp
+        if "timestamp" not in entry:
+            entry["timestamp"] = datetime.now().isoformat()
+
+        with self._writer_lock:
+            self._queue.put(dict(entry))
+            if self._writer is None:
+                _managers_to_flush.add(self)
+                self._writer = threading.Thread(
+                    target=self._drain, name="history-writer", daemon=True
+                )
+                self._writer.start()
+
+    def flush(self) -> None:
+        """Wait until every added entry has been written to disk."""
+        self._queue.join()
+
+    def _drain(self) -> None:
+        """Write queued entries in batches, exiting once the queue is empty."""
+        while True:
+            with self._writer_lock:
+                if self._queue.empty():
+                    self._writer = None
+                    return
+
+            entries = []
+            while len(entries) < _WRITE_BATCH_SIZE:
+                try:
+                    entries.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_entries(entries)
+                logger.info(f"Added {len(entries)} entr{'y' if len(entries) == 1 else 'ies'} to history")
+            except Exception as e:
+                logger.error(f"Failed to add history entry: {e}")
+            finally:
+                for _ in entries:
+                    self._queue.task_done()
+
+    def _write_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """Append entries to the history file with one write and record their offsets."""
+        lines = [json_utils.dumps(entry) + b"\n" for entry in entries]
+
+        # Append to JSONL file
+        offset = self._append(b"".join(lines))
+
+        # Record each line's offset; a missing offsets file is rebuilt on demand
+        if offset == 0 or self.offsets_path.exists():
+            try:
+                self._append_offsets(offset, lines, [entry.get("timestamp", "") for entry in entries])
+            except (OSError, ValueError) as e:
+                logger.debug(f"Discarding history offsets file: {e}")
+                self.offsets_path.unlink(missing_ok=True)
+
+    def _append_offsets(self, start: int, lines: List[bytes], timestamps: List[str]) -> None:
+        """
+        Add offsets for lines just appended to the history file.
 
-            # Append to JSONL file
-            with open(self.history_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        Args:
+            start: Byte offset at which the lines were written
+            lines: The lines written
+            timestamps: Timestamps of the entries on those lines
 
-            logger.info("Added entry to history")
-        except Exception as e:
-            logger.error(f"Failed to add history entry: {e}")
+        Raises:
+            ValueError: If the offsets file can't simply be extended and has
+                to be rebuilt instead
+        """
+        # Appending keeps the offsets in timestamp order only if the new
+        # entries are no older than every entry already recorded
+        if timestamps != sorted(timestamps):
+            raise ValueError("entries written out of timestamp order")
+
+        records = []
+        offset = start
+        for line in lines:
+            records.append(_OFFSET.pack(offset))
+            offset += len(line)
+        records.append(_OFFSET.pack(offset))
+
+        if start == 0:
+            self.offsets_path.write_bytes(b"".join(records))
+            return
+
+        with open(self.offsets_path, "r+b") as f:
+            count = f.seek(0, os.SEEK_END) // _OFFSET.size
+            if count == 0:
+                raise ValueError("offsets file is empty")
+            f.seek((count - 1) * _OFFSET.size)
+            if _OFFSET.unpack(f.read(_OFFSET.size))[0] != start:
+                raise ValueError("offsets file does not end where the new lines start")
+            if count > 1:
+                f.seek((count - 2) * _OFFSET.size)
+                if timestamps[0] < self._timestamp_at(_OFFSET.unpack(f.read(_OFFSET.size))[0]):
+                    raise ValueError("entries older than the newest recorded entry")
+            # Replace the size record with the new offsets and size
+            f.seek((count - 1) * _OFFSET.size)
+            f.write(b"".join(records))
+
+    def _timestamp_at(self, offset: int) -> str:
+        """Read the timestamp of the history line starting at a byte offset."""
+        with open(self.history_path, "rb") as f:
+            f.seek(offset)
+            return json_utils.loads(f.readline()).get("timestamp", "")
 
     def get_all_entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -52,34 +249,73 @@ class HistoryManager:
         Returns:
             List of history entries
         """
-        entries = []
-
-        if not self.history_path.exists():
-            return entries
-
+        self.flush()
+        with self._read_lock:
+            try:
+                self._refresh_cache()
+            except Exception as e:
+                logger.error(f"Failed to read history: {e}")
+                return []
+
+            # Most recent first
+            entries = self._cache[::-1]
+
+        # Apply limit if specified
+        if limit:
+            entries = entries[:limit]
+
+        return entries
+
+    def _reset_cache(self) -> None:
+        """Forget all parsed entries so the next read starts from scratch."""
+        self._cache = []
+        self._cache_mtime_ns = 0
+        self._cache_bytes_read = 0
+        self._cache_fingerprint = None
+
+    def _refresh_cache(self) -> None:
+        """Parse only the lines appended to the history file since the last read."""
         try:
-            with open(self.history_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            entries.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            logger.warning(f"Invalid JSON in history: {line[:50]}")
-                            continue
-
-            # Sort by timestamp (most recent first)
-            entries.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-            # Apply limit if specified
-            if limit:
-                entries = entries[:limit]
-
-            return entries
-
-        except Exception as e:
-            logger.error(f"Failed to read history: {e}")
-            return []
+            stat = self.history_path.stat()
+        except FileNotFoundError:
+            self._reset_cache()
+            return
+
+        if stat.st_mtime_ns == self._cache_mtime_ns and stat.st_size == self._cache_bytes_read:
+            return
+
+        # File was truncated or replaced; start over
+        fingerprint = file_fingerprint(self.history_path, stat)
+        if stat.st_size < self._cache_bytes_read or fingerprint != self._cache_fingerprint:
+            self._reset_cache()
+            self._cache_fingerprint = fingerprint
+
+        with open(self.history_path, "rb") as f:
+            f.seek(self._cache_bytes_read)
+            data = f.read()
+
+        # Leave a partially written last line for the next read
+        end = data.rfind(b"\n") + 1
+        new_entries = []
+        for line in data[:end].splitlines():
+            line = line.strip()
+            if line:
+                try:
+                    new_entries.append(json_utils.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Invalid JSON in history: {line[:50]!r}")
+
+        if new_entries:
+            last_timestamp = self._cache[-1].get("timestamp", "") if self._cache else ""
+            self._cache.extend(new_entries)
+            # Entries are appended in chronological order; only re-sort if
+            # something was written with an older timestamp.
+            timestamps = [e.get("timestamp", "") for e in new_entries]
+            if timestamps[0] < last_timestamp or timestamps != sorted(timestamps):
+                self._cache.sort(key=lambda x: x.get("timestamp", ""))
+
+        self._cache_bytes_read += end
+        self._cache_mtime_ns = stat.st_mtime_ns
 
     def search_entries(
         self,
@@ -100,10 +336,21 @@ class HistoryManager:
             end_date: Filter by end date (ISO format)
 
         Returns:
-            List of matching history entries
+            List of matching history entries (best text matches first, then
+            most recent, when a query is given; otherwise most recent first).
+            Query words match the start of words in the prompts, e.g.
+            "pyth" finds "python" but "thon" doesn't.
         """
+        self.flush()
+        if query:
+            with self._read_lock:
+                matches = self.index.search(query, provider, model, start_date, end_date)
+            if matches is not None:
+                return matches
+
         all_entries = self.get_all_entries()
         filtered = []
+        query_lower = query.lower() if query else None
 
         for entry in all_entries:
             # Apply filters
@@ -119,8 +366,7 @@ class HistoryManager:
             if end_date and entry.get("timestamp", "") > end_date:
                 continue
 
-            if query:
-                query_lower = query.lower()
+            if query_lower:
                 original = entry.get("original_prompt", "").lower()
                 enhanced = entry.get("enhanced_prompt", "").lower()
                 if query_lower not in original and query_lower not in enhanced:
@@ -140,16 +386,102 @@ class HistoryManager:
         Returns:
             History entry or None if not found
         """
+        if index < 0:
+            return None
+        self.flush()
+
+        # Without parsed entries in memory, seek straight to the line
+        if not self._cache_bytes_read:
+            try:
+                offset = self._entry_offset(index)
+                if offset is None:
+                    return None
+                with open(self.history_path, "rb") as f:
+                    f.seek(offset)
+                    return json_utils.loads(f.readline())
+            except (OSError, ValueError) as e:
+                logger.warning(f"History offset lookup failed, reading full history: {e}")
+
         entries = self.get_all_entries()
-        if 0 <= index < len(entries):
+        if index < len(entries):
             return entries[index]
         return None
 
+    def _entry_offset(self, index: int) -> Optional[int]:
+        """
+        Look up the byte offset of an entry in the offsets file.
+
+        Args:
+            index: Entry index (0 = most recent)
+
+        Returns:
+            Byte offset of the entry's line, or None if there is no such entry
+
+        Raises:
+            ValueError: If the offsets file can't be brought up to date
+        """
+        for attempt in range(2):
+            try:
+                with open(self.offsets_path, "rb") as f:
+                    count = f.seek(0, os.SEEK_END) // _OFFSET.size
+                    if self._offsets_current(f, count):
+                        # The last record is the covered size, not an entry
+                        if index >= count - 1:
+                            return None
+                        f.seek((count - 2 - index) * _OFFSET.size)
+                        return _OFFSET.unpack(f.read(_OFFSET.size))[0]
+            except FileNotFoundError:
+                pass
+            if attempt == 0:
+                self._rebuild_offsets()
+        raise ValueError("offsets file does not match the history file")
+
+    def _offsets_current(self, offsets_file, count: int) -> bool:
+        """Check that the offsets file covers the whole history file."""
+        if count == 0:
+            return False
+        try:
+            size = self.history_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        offsets_file.seek((count - 1) * _OFFSET.size)
+        return _OFFSET.unpack(offsets_file.read(_OFFSET.size))[0] == size
+
+    def _rebuild_offsets(self) -> None:
+        """Rewrite the offsets file from the history file."""
+        # Same entries, in the same order, as get_all_entries(): lines that
+        # don't parse are skipped and the rest are stably sorted by timestamp
+        located = []
+        end = 0
+        if self.history_path.exists():
+            with open(self.history_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    if line.strip():
+                        try:
+                            located.append((json_utils.loads(line).get("timestamp", ""), offset))
+                        except ValueError:
+                            pass
+                    offset += len(line)
+                end = offset
+        located.sort(key=lambda item: item[0])
+        offsets = [offset for _, offset in located]
+        offsets.append(end)
+        self.offsets_path.write_bytes(b"".join(_OFFSET.pack(o) for o in offsets))
+
     def clear_history(self) -> None:
         """Clear all history."""
+        self.flush()
         try:
+            self.close()
             if self.history_path.exists():
                 self.history_path.unlink()
+            self.offsets_path.unlink(missing_ok=True)
+            with self._read_lock:
+                self._reset_cache()
+                self.index.clear()
             logger.info("History cleared")
         except Exception as e:
             logger.error(f"Failed to clear history: {e}")
@@ -166,14 +498,13 @@ class HistoryManager:
 
         try:
             if format == "json":
-                output_path.write_text(
-                    json.dumps(entries, indent=2, ensure_ascii=False),
-                    encoding="utf-8"
-                )
+                output_path.write_bytes(json_utils.dumps(entries, indent=True))
             else:  # jsonl
-                with open(output_path, "w", encoding="utf-8") as f:
-                    for entry in entries:
-                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                # One write per batch keeps memory bounded for huge histories
+                with open(output_path, "wb") as f:
+                    for start in range(0, len(entries), _EXPORT_BATCH_SIZE):
+                        batch = entries[start:start + _EXPORT_BATCH_SIZE]
+                        f.write(b"".join(json_utils.dumps(entry) + b"\n" for entry in batch))
 
             logger.info(f"Exported {len(entries)} entries to {output_path}")
         except Exception as e:
@@ -0,0 +1,241 @@
+"""
+Full-text search index for PromptAlchemy history.
+
+history.jsonl stays the source of truth. This module mirrors it into an
+SQLite FTS5 table next to it so that searching prompts doesn't mean scanning
+every entry. The index catches up incrementally by parsing only the bytes
+appended since the last sync.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import struct
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import json_utils
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Bytes of the first line that go into a history file's fingerprint
+_FINGERPRINT_BYTES = 4096
+_FILE_ID = struct.Struct("<QQ")
+
+
+def file_fingerprint(path: Path, stat: os.stat_result) -> int:
+    """
+    Identify a history file, so a replaced file isn't mistaken for an append.
+
+    Combines the file's device and inode, which change when another file is
+    moved into place, with its first line, which an in-place rewrite changes.
+
+    Args:
+        path: Path to the history file
+        stat: Result of stat() on that file
+
+    Returns:
+        Fingerprint as a 32-bit integer
+    """
+    with open(path, "rb") as f:
+        first_line = f.readline(_FINGERPRINT_BYTES)
+    file_id = _FILE_ID.pack(stat.st_dev & 0xFFFFFFFFFFFFFFFF, stat.st_ino & 0xFFFFFFFFFFFFFFFF)
+    return zlib.crc32(first_line, zlib.crc32(file_id))
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word must match, and the last word of the text also matches as a
+    prefix, so search-as-you-type finds partially typed words.
+
+    Args:
+        query: Text entered by the user
+
+    Returns:
+        MATCH expression, or "" if the text contains no words
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return ""
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class HistoryIndex:
+    """SQLite FTS5 index over the entries in a history JSONL file."""
+
+    def __init__(self, db_path: Path, history_path: Path):
+        """
+        Initialize the history index.
+
+        Args:
+            db_path: Path to the SQLite database file
+            history_path: Path to the history JSONL file being indexed
+        """
+        self.db_path = db_path
+        self.history_path = history_path
+        self.available = True
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5("
+                    "original_prompt, enhanced_prompt, provider UNINDEXED, "
+                    "model UNINDEXED, timestamp UNINDEXED, entry UNINDEXED, "
+                    "tokenize='porter unicode61')"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+                )
+        except sqlite3.Error as e:
+            # FTS5 is compiled into most, but not all, SQLite builds
+            logger.info(f"History search index unavailable, using linear search: {e}")
+            self.available = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation, committing on success."""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def sync(self) -> None:
+        """Index any entries appended to the history file since the last sync."""
+        if not self.available:
+            return
+
+        with self._connect() as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+            offset = meta.get("bytes_indexed", 0)
+
+            try:
+                stat = self.history_path.stat()
+            except FileNotFoundError:
+                stat = None
+            size = stat.st_size if stat else 0
+            mtime_ns = stat.st_mtime_ns if stat else 0
+
+            if size == offset and mtime_ns == meta.get("mtime_ns"):
+                return
+
+            # File was truncated or replaced; rebuild from scratch
+            fingerprint = file_fingerprint(self.history_path, stat) if stat else 0
+            if size < offset or fingerprint != meta.get("fingerprint"):
+                conn.execute("DELETE FROM entries")
+                offset = 0
+
+            rows = []
+            if size:
+                with open(self.history_path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read()
+
+                # Leave a partially written last line for the next sync
+                end = data.rfind(b"\n") + 1
+                for line in data[:end].splitlines():
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json_utils.loads(line)
+                    except ValueError:
+                        continue
+                    rows.append((
+                        entry.get("original_prompt", ""),
+                        entry.get("enhanced_prompt", ""),
+                        entry.get("provider"),
+                        entry.get("model"),
+                        entry.get("timestamp", ""),
+                        line.decode("utf-8")
+                    ))
+                offset += end
+
+            conn.executemany(
+                "INSERT INTO entries (original_prompt, enhanced_prompt, provider, model, timestamp, entry) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (("bytes_indexed", offset), ("mtime_ns", mtime_ns), ("fingerprint", fingerprint))
+            )
+
+    def search(
+        self,
+        query: str,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Search indexed entries, best matches first.
+
+        Args:
+            query: Text to search in prompts
+            provider: Filter by provider
+            model: Filter by model
+            start_date: Filter by start date (ISO format)
+            end_date: Filter by end date (ISO format)
+            limit: Maximum number of entries to return
+
+        Returns:
+            Matching history entries, or None if the index can't answer the
+            query and the caller should fall back to a linear search
+        """
+        match = build_match_query(query)
+        if not self.available or not match:
+            return None
+
+        sql = "SELECT entry FROM entries WHERE entries MATCH ?"
+        params: List[Any] = [match]
+        if provider:
+            sql += " AND provider = ?"
+            params.append(provider)
+        if model:
+            sql += " AND model = ?"
+            params.append(model)
+        if start_date:
+            sql += " AND timestamp >= ?"
+            params.append(start_date)
+        if end_date:
+            sql += " AND timestamp <= ?"
+            params.append(end_date)
+        # Equal scores go newest first, as unfiltered history does
+        sql += " ORDER BY rank, rowid DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            self.sync()
+            with self._connect() as conn:
+                rows = conn.execute(sql, params).fetchall()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"History index search failed: {e}")
+            return None
+
+        return [json_utils.loads(row[0]) for row in rows]
+
+    def clear(self) -> None:
+        """Remove all indexed entries."""
+        if not self.available:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM entries")
+                conn.execute("DELETE FROM meta")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to clear history index: {e}")
@@ -6,16 +6,21 @@ When adding new models or providers, update this file ONLY.
 All UI components and configuration will automatically use the updated lists.
 """
 
-from typing import Dict, List, Optional
+import sys
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
+# dataclass(slots=True) needs Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class LLMProvider:
     """Represents an LLM provider with available models and configuration."""
     id: str
     display_name: str
-    models: List[str]
+    models: Tuple[str, ...]
     enabled_by_default: bool = True
     requires_api_key: bool = True
     supports_cloud_auth: bool = False  # NEW: Cloud authentication support
@@ -29,7 +34,7 @@ LLM_PROVIDERS = {
     'openai': LLMProvider(
         id='openai',
         display_name='OpenAI',
-        models=[
+        models=(
             'gpt-5-chat-latest',    # NEWEST: GPT-5 (latest)
             'gpt-4o',
             'gpt-4.1',              # NEW: GPT-4.1
@@ -39,7 +44,7 @@ LLM_PROVIDERS = {
             'gpt-4-turbo',
             'gpt-4',
             'gpt-3.5-turbo'
-        ],
+        ),
         enabled_by_default=True,
         requires_api_key=True,
         supports_cloud_auth=False,
@@ -49,7 +54,7 @@ LLM_PROVIDERS = {
     'anthropic': LLMProvider(
         id='anthropic',
         display_name='Anthropic',
-        models=[
+        models=(
             'claude-sonnet-4-5',    # NEWEST: Sonnet 4.5 (released Sept 2025)
             'claude-opus-4-1',      # NEW: Opus 4.1
             'claude-opus-4',
@@ -60,7 +65,7 @@ LLM_PROVIDERS = {
             'claude-3-opus',
             'claude-3-sonnet',
             'claude-3-haiku'
-        ],
+        ),
         enabled_by_default=True,
         requires_api_key=True,
         supports_cloud_auth=False,
@@ -70,7 +75,7 @@ LLM_PROVIDERS = {
     'gemini': LLMProvider(
         id='gemini',
         display_name='Google Gemini',
-        models=[
+        models=(
             'gemini-2.5-pro',           # NEW: Gemini 2.5 Pro
             'gemini-2.5-flash',         # NEW: Gemini 2.5 Flash
             'gemini-2.5-flash-lite',    # NEW: Gemini 2.5 Flash Lite
@@ -81,7 +86,7 @@ LLM_PROVIDERS = {
             'gemini-1.5-pro',
             'gemini-1.5-flash',
             'gemini-1.0-pro'
-        ],
+        ),
         enabled_by_default=True,
         requires_api_key=True,
         supports_cloud_auth=True,   # NEW: Supports Google Cloud auth
@@ -91,7 +96,7 @@ LLM_PROVIDERS = {
     'ollama': LLMProvider(
         id='ollama',
         display_name='Ollama (Local)',
-        models=[
+        models=(
             'llama3.2:latest',
             'llama3.1:8b',
             'llama3.1:70b',
@@ -100,7 +105,7 @@ LLM_PROVIDERS = {
             'phi3:medium',
             'qwen2.5:72b',
             'deepseek-r1:70b'
-        ],
+        ),
         enabled_by_default=False,
         requires_api_key=False,
         supports_cloud_auth=False,
@@ -111,10 +116,10 @@ LLM_PROVIDERS = {
     'lmstudio': LLMProvider(
         id='lmstudio',
         display_name='LM Studio (Local)',
-        models=[
+        models=(
             'local-model',
             'custom-model'
-        ],
+        ),
         enabled_by_default=False,
         requires_api_key=False,
         supports_cloud_auth=False,
@@ -123,10 +128,22 @@ LLM_PROVIDERS = {
     )
 }
 
+# Lower-cased provider ID -> provider, so lookups are case-insensitive
+_PROVIDERS_BY_ID = {pid.lower(): provider for pid, provider in LLM_PROVIDERS.items()}
+
+_PROVIDER_IDS = tuple(LLM_PROVIDERS)
+
+_ENABLED_PROVIDERS = tuple(pid for pid, provider in LLM_PROVIDERS.items() if provider.enabled_by_default)
+
+
+def _lookup(provider_id: str) -> Optional[LLMProvider]:
+    """Find a provider by ID, only lower-casing the ID if it isn't found as given."""
+    return _PROVIDERS_BY_ID.get(provider_id) or _PROVIDERS_BY_ID.get(provider_id.lower())
+
 
 # Helper functions for easy access
 
-def get_provider_models(provider_id: str) -> List[str]:
+def get_provider_models(provider_id: str) -> Sequence[str]:
     """
     Get model list for a provider.
 
@@ -134,20 +151,20 @@ def get_provider_models(provider_id: str) -> List[str]:
         provider_id: Provider identifier (e.g., 'openai', 'anthropic')
 
     Returns:
-        List of model names for the provider
+        Model names for the provider
     """
-    provider_id_lower = provider_id.lower()
-    return LLM_PROVIDERS[provider_id_lower].models if provider_id_lower in LLM_PROVIDERS else []
+    provider = _lookup(provider_id)
+    return provider.models if provider else ()
 
 
-def get_all_provider_ids() -> List[str]:
+def get_all_provider_ids() -> Tuple[str, ...]:
     """
     Get all provider IDs.
 
     Returns:
-        List of provider identifiers
+        Provider identifiers
     """
-    return list(LLM_PROVIDERS.keys())
+    return _PROVIDER_IDS
 
 
 def get_provider_display_name(provider_id: str) -> str:
@@ -160,8 +177,8 @@ def get_provider_display_name(provider_id: str) -> str:
     Returns:
         Human-readable display name
     """
-    provider_id_lower = provider_id.lower()
-    return LLM_PROVIDERS[provider_id_lower].display_name if provider_id_lower in LLM_PROVIDERS else provider_id
+    provider = _lookup(provider_id)
+    return provider.display_name if provider else provider_id
 
 
 def get_provider_config(provider_id: str) -> Optional[LLMProvider]:
@@ -174,8 +191,7 @@ def get_provider_config(provider_id: str) -> Optional[LLMProvider]:
     Returns:
         LLMProvider object or None if not found
     """
-    provider_id_lower = provider_id.lower()
-    return LLM_PROVIDERS.get(provider_id_lower)
+    return _lookup(provider_id)
 
 
 def get_provider_prefix(provider_id: str) -> str:
@@ -188,18 +204,18 @@ def get_provider_prefix(provider_id: str) -> str:
     Returns:
         LiteLLM prefix string (e.g., 'gemini/', 'ollama/')
     """
-    provider_id_lower = provider_id.lower()
-    return LLM_PROVIDERS[provider_id_lower].prefix if provider_id_lower in LLM_PROVIDERS else ''
+    provider = _lookup(provider_id)
+    return provider.prefix if provider else ''
 
 
-def get_enabled_providers() -> List[str]:
+def get_enabled_providers() -> Tuple[str, ...]:
     """
-    Get list of providers enabled by default.
+    Get providers enabled by default.
 
     Returns:
-        List of provider IDs that are enabled by default
+        Provider IDs that are enabled by default
     """
-    return [pid for pid, provider in LLM_PROVIDERS.items() if provider.enabled_by_default]
+    return _ENABLED_PROVIDERS
 
 
 def supports_cloud_auth(provider_id: str) -> bool:
@@ -212,11 +228,11 @@ def supports_cloud_auth(provider_id: str) -> bool:
     Returns:
         True if provider supports cloud auth (e.g., Google Cloud)
     """
-    provider_id_lower = provider_id.lower()
-    provider = LLM_PROVIDERS.get(provider_id_lower)
+    provider = _lookup(provider_id)
     return provider.supports_cloud_auth if provider else False
 
 
+@lru_cache(maxsize=256)
 def format_model_name(provider_id: str, model: str) -> str:
     """
     Format model name with provider prefix for litellm.
@@ -230,3 +246,17 @@ def format_model_name(provider_id: str, model: str) -> str:
     """
     prefix = get_provider_prefix(provider_id)
     return f"{prefix}{model}" if prefix else model
+
+
+def _format_providers_help() -> str:
+    """Render every provider and its models as the CLI listing text."""
+    lines = []
+    for provider in LLM_PROVIDERS.values():
+        lines.append(f"{provider.display_name} ({provider.id}):")
+        lines.extend(f"  - {model}" for model in provider.models)
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+# Provider/model listing, rendered once since LLM_PROVIDERS is static
+PROVIDERS_HELP_TEXT = _format_providers_help()
@@ -4,12 +4,54 @@ Logging configuration for PromptAlchemy.
 Provides rotating file handlers with automatic log rotation in the AppData folder.
 """
 
+import atexit
 import logging
+import re
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from queue import SimpleQueue
 from typing import Optional
 
+# Block size used when reading the end of the log file
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+# Config keys whose values are masked in change logs
+_SENSITIVE_KEY_RE = re.compile(r"key|password|token|secret", re.IGNORECASE)
+
+# Background thread that hands queued log records to the real handlers
+_listener: Optional[QueueListener] = None
+
+
+class _SampledRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that checks the file size every N records.
+
+    The stock handler stats the file on every record. Checking every
+    ROLLOVER_CHECK_INTERVAL records instead lets a file overshoot maxBytes
+    by at most that many records before it rotates.
+    """
+
+    ROLLOVER_CHECK_INTERVAL = 128
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._records_since_check = 0
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        # Check the first record too, so an already oversized file rotates promptly
+        check = self._records_since_check == 0
+        self._records_since_check = (self._records_since_check + 1) % self.ROLLOVER_CHECK_INTERVAL
+        return check and bool(super().shouldRollover(record))
+
+
+def _stop_listener() -> None:
+    """Flush queued log records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logging(config_dir: Path, log_level: str = "INFO", console_output: bool = True) -> Path:
     """
@@ -45,10 +87,11 @@ def setup_logging(config_dir: Path, log_level: str = "INFO", console_output: boo
 
     # Clear existing handlers
     root_logger.handlers.clear()
+    _stop_listener()
 
     # Create rotating file handler
     # Max size: 10MB per file, keep 5 backup files
-    file_handler = RotatingFileHandler(
+    file_handler = _SampledRotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5,
@@ -56,14 +99,22 @@ def setup_logging(config_dir: Path, log_level: str = "INFO", console_output: boo
     )
     file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+    handlers = [file_handler]
 
     # Add console handler if requested
     if console_output:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)  # Console shows INFO and above
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    # Loggers only enqueue records; a background thread does the disk and
+    # console I/O (including rotation) so logging never blocks the caller
+    global _listener
+    log_queue = SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     # Log startup message
     logger = logging.getLogger(__name__)
@@ -77,6 +128,9 @@ def setup_logging(config_dir: Path, log_level: str = "INFO", console_output: boo
     return log_file
 
 
+atexit.register(_stop_listener)
+
+
 def log_exception(logger: logging.Logger, exc: Exception, context: str = ""):
     """
     Log an exception with full traceback.
@@ -105,16 +159,17 @@ def log_api_call(logger: logging.Logger, provider: str, model: str, success: boo
         tokens: Number of tokens used (if applicable)
         error: Error message (if failed)
     """
+    # Messages are %-formatted by logging, and only if the record is emitted
     if success:
-        msg = f"API Call Success - Provider: {provider}, Model: {model}"
         if tokens:
-            msg += f", Tokens: {tokens}"
-        logger.info(msg)
+            logger.info("API Call Success - Provider: %s, Model: %s, Tokens: %s", provider, model, tokens)
+        else:
+            logger.info("API Call Success - Provider: %s, Model: %s", provider, model)
     else:
-        msg = f"API Call Failed - Provider: {provider}, Model: {model}"
         if error:
-            msg += f", Error: {error}"
-        logger.error(msg)
+            logger.error("API Call Failed - Provider: %s, Model: %s, Error: %s", provider, model, error)
+        else:
+            logger.error("API Call Failed - Provider: %s, Model: %s", provider, model)
 
 
 def log_config_change(logger: logging.Logger, key: str, old_value: any, new_value: any):
@@ -127,8 +182,12 @@ def log_config_change(logger: logging.Logger, key: str, old_value: any, new_valu
         old_value: Previous value
         new_value: New value
     """
+    # Setters often re-apply the current value; nothing changed, nothing to log
+    if old_value == new_value or not logger.isEnabledFor(logging.INFO):
+        return
+
     # Mask sensitive values
-    if 'key' in key.lower() or 'password' in key.lower() or 'token' in key.lower():
+    if _SENSITIVE_KEY_RE.search(key):
         old_str = "***" if old_value else "None"
         new_str = "***" if new_value else "None"
     else:
@@ -176,10 +235,19 @@ def get_recent_logs(config_dir: Path, lines: int = 100) -> str:
         return "No log file found"
 
     try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            all_lines = f.readlines()
-            recent_lines = all_lines[-lines:]
-            return ''.join(recent_lines)
+        # Read backwards in blocks until enough lines are in hand, so large
+        # logs aren't loaded in full
+        with open(log_file, 'rb') as f:
+            position = f.seek(0, 2)
+            data = b''
+            while position > 0 and data.count(b'\n') <= lines:
+                read_size = min(_TAIL_BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                data = f.read(read_size) + data
+
+        recent_lines = data.splitlines(keepends=True)[-lines:] if lines > 0 else []
+        return b''.join(recent_lines).decode('utf-8', errors='replace').replace('\r\n', '\n')
     except Exception as e:
         return f"Error reading log file: {e}"
 
@@ -0,0 +1,123 @@
+"""
+MIME type detection for attachments.
+
+A fixed extension map covers the file types people actually attach; other
+extensions go to the system MIME registry, and files it doesn't know are
+identified from their first bytes.
+"""
+
+import mimetypes
+from pathlib import Path
+from types import MappingProxyType
+
+DEFAULT_MIME_TYPE = "application/octet-stream"
+
+EXT_MIME = MappingProxyType({
+    # Images
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "bmp": "image/bmp",
+    # Documents
+    "pdf": "application/pdf",
+    # Text and source code
+    "txt": "text/plain",
+    "log": "text/plain",
+    "md": "text/markdown",
+    "markdown": "text/markdown",
+    "rst": "text/x-rst",
+    "csv": "text/csv",
+    "tsv": "text/tab-separated-values",
+    "html": "text/html",
+    "htm": "text/html",
+    "css": "text/css",
+    "xml": "text/xml",
+    "py": "text/x-python",
+    "js": "text/javascript",
+    "ts": "text/x-typescript",
+    "sh": "text/x-sh",
+    "c": "text/x-c",
+    "h": "text/x-c",
+    "cpp": "text/x-c++",
+    "java": "text/x-java",
+    "go": "text/x-go",
+    "rs": "text/x-rust",
+    "json": "application/json",
+    "yaml": "application/yaml",
+    "yml": "application/yaml",
+    "toml": "application/toml",
+})
+
+# Non-text/* types whose content is readable text
+_TEXT_APPLICATION_TYPES = frozenset({
+    "application/json",
+    "application/yaml",
+    "application/toml",
+})
+
+# Sizes of the known BMP DIB headers, stored little-endian at bytes 14-17
+_BMP_DIB_HEADER_SIZES = frozenset({12, 40, 52, 56, 64, 108, 124})
+
+# (offset, signature, MIME type) for files with an unknown extension
+_SIGNATURES = (
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (8, b"WEBP", "image/webp"),
+    (0, b"BM", "image/bmp"),  # Also checked against the DIB header size
+    (0, b"%PDF", "application/pdf"),
+)
+
+
+def _sniff(path: Path) -> str:
+    """Identify a file from its first bytes."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(18)
+    except OSError:
+        return DEFAULT_MIME_TYPE
+
+    for offset, signature, mime_type in _SIGNATURES:
+        if header[offset:offset + len(signature)] == signature:
+            # WEBP is RIFF....WEBP; make sure the container matches too
+            if mime_type == "image/webp" and not header.startswith(b"RIFF"):
+                continue
+            # "BM" alone is too common a start for text files
+            if mime_type == "image/bmp" and (
+                    int.from_bytes(header[14:18], "little") not in _BMP_DIB_HEADER_SIZES):
+                continue
+            return mime_type
+    return DEFAULT_MIME_TYPE
+
+
+def guess(path: Path) -> str:
+    """
+    Guess the MIME type of a file.
+
+    Args:
+        path: File path
+
+    Returns:
+        MIME type, or DEFAULT_MIME_TYPE if it can't be determined
+    """
+    mime_type = EXT_MIME.get(path.suffix.lower().lstrip("."))
+    if mime_type:
+        return mime_type
+    mime_type, _ = mimetypes.guess_type(path.name)
+    return mime_type if mime_type else _sniff(path)
+
+
+def is_text(mime_type: str) -> bool:
+    """
+    Check whether a MIME type holds readable text.
+
+    Args:
+        mime_type: MIME type
+
+    Returns:
+        True for text/* and text-based formats such as JSON and YAML
+    """
+    return mime_type.startswith("text/") or mime_type in _TEXT_APPLICATION_TYPES
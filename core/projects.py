@@ -1,13 +1,94 @@
 """Project management for organizing prompt enhancements."""
 
+import heapq
+import io
 import json
 import logging
+import os
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
 
+from . import json_utils
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Size at which a project with compression enabled switches to prompts.jsonl.zst
+COMPRESS_THRESHOLD_BYTES = 1024 * 1024
+
+
+class _SafeNameTable(dict):
+    """str.translate table mapping characters not allowed in directory names to '_'."""
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        safe = char if char.isalnum() or char in "-_" else "_"
+        self[codepoint] = safe
+        return safe
+
+
+# Filled in lazily, one entry per distinct character seen
+_SAFE_NAME_TABLE = _SafeNameTable()
+
+
+def _most_recent(items: List[Dict[str, Any]], key: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+    """Sort items newest first by an ISO timestamp field, keeping at most `limit`."""
+    if limit is not None and limit < len(items):
+        # Partial selection instead of sorting everything
+        return heapq.nlargest(limit, items, key=lambda x: x.get(key, ""))
+    items.sort(key=lambda x: x.get(key, ""), reverse=True)
+    return items
+
+
+def _read_prompts_file(prompts_path: Path) -> bytes:
+    """Read a prompts file, decompressing it if it is a .zst file."""
+    data = prompts_path.read_bytes()
+    if prompts_path.suffix != ".zst":
+        return data
+    if not ZSTD_AVAILABLE:
+        raise RuntimeError(f"zstandard is required to read {prompts_path}")
+    # Each appended prompt is its own zstd frame
+    reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True)
+    return reader.read()
+
+
+@lru_cache(maxsize=64)
+def _load_prompts(prompts_path: str, mtime_ns: int, size: int) -> Tuple[Dict[str, Any], ...]:
+    """
+    Parse a prompts.jsonl (or prompts.jsonl.zst) file, most recent first.
+
+    Cached by modification time and size, so the file is only parsed again
+    after it changes.
+    """
+    prompts = []
+    data = _read_prompts_file(Path(prompts_path))
+    for line in data.splitlines():
+        if line.strip():
+            try:
+                prompts.append(json_utils.loads(line))
+            except json.JSONDecodeError:
+                continue
+
+    # Sort by timestamp (most recent first)
+    prompts.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+    return tuple(prompts)
+
+
+@lru_cache(maxsize=4096)
+def _safe_name(name: str) -> str:
+    """Sanitize a project name for use as a directory name."""
+    return name.translate(_SAFE_NAME_TABLE)
+
 
 class Project:
     """Represents a project collection of prompt enhancements."""
@@ -24,6 +105,19 @@ class Project:
         self.path = path
         self.metadata_path = path / "project.json"
         self.prompts_path = path / "prompts.jsonl"
+        self.compressed_prompts_path = path / "prompts.jsonl.zst"
+
+        # Metadata saves are deferred while inside batch()
+        self._batch_depth = 0
+        self._dirty = False
+
+        # Bytes last written to project.json, to skip rewriting identical metadata
+        self._last_serialized: Optional[bytes] = None
+
+        # Append handle for prompts.jsonl, opened on first add_prompt()
+        self._prompts_file = None
+        self._compressor = None
+        self._prompts_file_finalizer: Optional[weakref.finalize] = None
 
         # Create project directory
         self.path.mkdir(parents=True, exist_ok=True)
@@ -31,11 +125,15 @@ class Project:
         # Load or create metadata
         self.metadata = self._load_metadata()
 
+        # Projects from before prompt_count was tracked get it counted once
+        if "prompt_count" not in self.metadata:
+            self.recount_prompts()
+
     def _load_metadata(self) -> Dict[str, Any]:
         """Load project metadata."""
         if self.metadata_path.exists():
             try:
-                return json.loads(self.metadata_path.read_text(encoding="utf-8"))
+                return json_utils.loads(self.metadata_path.read_bytes())
             except (json.JSONDecodeError, OSError):
                 pass
 
@@ -47,33 +145,97 @@ class Project:
             "tags": []
         }
 
+    @contextmanager
+    def batch(self) -> Iterator["Project"]:
+        """
+        Defer metadata saves until the end of the block.
+
+        Example:
+            with project.batch():
+                project.set_description("...")
+                project.add_tags("a", "b")
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self._save_metadata()
+
     def _save_metadata(self) -> None:
-        """Save project metadata."""
+        """Save project metadata (deferred inside batch())."""
+        if self._batch_depth:
+            self._dirty = True
+            return
+
+        self._dirty = False
         try:
-            self.metadata_path.write_text(
-                json.dumps(self.metadata, indent=2, ensure_ascii=False),
-                encoding="utf-8"
-            )
+            data = json_utils.dumps(self.metadata, indent=True)
+            if data == self._last_serialized:
+                return
+
+            # Write a temp file and swap it in so a crash can't leave a truncated file
+            tmp_path = self.metadata_path.with_suffix(".json.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self.metadata_path)
+            self._last_serialized = data
         except Exception as e:
             logger.error(f"Failed to save project metadata: {e}")
 
+    def _active_prompts_path(self) -> Path:
+        """Path of the file currently holding the project's prompts."""
+        if self.compressed_prompts_path.exists():
+            return self.compressed_prompts_path
+        return self.prompts_path
+
+    def _count_prompts(self) -> int:
+        """Count the prompts stored in prompts.jsonl."""
+        try:
+            data = _read_prompts_file(self._active_prompts_path())
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logger.error(f"Failed to count project prompts: {e}")
+            return 0
+        return sum(1 for line in data.splitlines() if line.strip())
+
+    def recount_prompts(self) -> int:
+        """
+        Recount the project's prompts and store the count in its metadata.
+
+        Only needed if prompts.jsonl was edited outside PromptAlchemy.
+
+        Returns:
+            Number of prompts in the project
+        """
+        self.metadata["prompt_count"] = self._count_prompts()
+        self._save_metadata()
+        return self.metadata["prompt_count"]
+
     def set_description(self, description: str) -> None:
         """Set project description."""
+        if self.metadata.get("description") == description:
+            return
         self.metadata["description"] = description
         self._save_metadata()
 
     def add_tags(self, *tags: str) -> None:
         """Add tags to project."""
         current_tags = set(self.metadata.get("tags", []))
-        current_tags.update(tags)
-        self.metadata["tags"] = sorted(current_tags)
+        new_tags = sorted(current_tags.union(tags))
+        if new_tags == self.metadata.get("tags"):
+            return
+        self.metadata["tags"] = new_tags
         self._save_metadata()
 
     def remove_tags(self, *tags: str) -> None:
         """Remove tags from project."""
         current_tags = set(self.metadata.get("tags", []))
-        current_tags.difference_update(tags)
-        self.metadata["tags"] = sorted(current_tags)
+        new_tags = sorted(current_tags.difference(tags))
+        if new_tags == self.metadata.get("tags"):
+            return
+        self.metadata["tags"] = new_tags
         self._save_metadata()
 
     def add_prompt(self, prompt_data: Dict[str, Any]) -> None:
@@ -92,34 +254,122 @@ class Project:
             prompt_data["project"] = self.name
 
             # Append to prompts file
-            with open(self.prompts_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(prompt_data, ensure_ascii=False) + "\n")
+            line = json_utils.dumps(prompt_data) + b"\n"
+            prompts_file = self._open_prompts_file()
+            if self._compressor is not None:
+                line = self._compressor.compress(line)
+            prompts_file.write(line)
+            prompts_file.flush()
+
+            if (
+                self._compressor is None
+                and self.metadata.get("compress")
+                and prompts_file.tell() >= COMPRESS_THRESHOLD_BYTES
+            ):
+                self._compress_prompts_file()
+
+            self.metadata["prompt_count"] = self.metadata.get("prompt_count", 0) + 1
+            self._save_metadata()
+
+            # Drop parsed copies of the file as it was before this prompt
+            _load_prompts.cache_clear()
 
             logger.info(f"Added prompt to project: {self.name}")
         except Exception as e:
             logger.error(f"Failed to add prompt to project: {e}")
 
-    def get_all_prompts(self) -> List[Dict[str, Any]]:
-        """Get all prompts in the project."""
-        prompts = []
+    def _open_prompts_file(self):
+        """Get the append handle for the prompts file, opening it if needed."""
+        # Reopen if the file was deleted or replaced behind our back
+        if self._prompts_file is not None and os.fstat(self._prompts_file.fileno()).st_nlink == 0:
+            self.close()
+        if self._prompts_file is None:
+            path = self._active_prompts_path()
+            if path == self.compressed_prompts_path:
+                if not ZSTD_AVAILABLE:
+                    raise RuntimeError(f"zstandard is required to write {path}")
+                self._compressor = zstandard.ZstdCompressor(level=3)
+            self._prompts_file = open(path, "ab", buffering=64 * 1024)
+            self._prompts_file_finalizer = weakref.finalize(self, self._prompts_file.close)
+        return self._prompts_file
+
+    def close(self) -> None:
+        """Close the prompts file handle, if open."""
+        if self._prompts_file_finalizer is not None:
+            self._prompts_file_finalizer()
+            self._prompts_file_finalizer = None
+        self._prompts_file = None
+        self._compressor = None
+
+    def set_compression(self, enabled: bool) -> None:
+        """
+        Enable or disable zstd compression of the project's prompts.
 
-        if not self.prompts_path.exists():
-            return prompts
+        With compression enabled, prompts.jsonl is replaced by
+        prompts.jsonl.zst once it grows past COMPRESS_THRESHOLD_BYTES.
+        Disabling it decompresses an already compressed file.
+
+        Args:
+            enabled: Whether to compress the prompts file
+        """
+        if enabled and not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is not installed; run: pip install zstandard")
+
+        if bool(self.metadata.get("compress")) != enabled:
+            self.metadata["compress"] = enabled
+            self._save_metadata()
 
         try:
-            with open(self.prompts_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            prompts.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            continue
-
-            # Sort by timestamp (most recent first)
-            prompts.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-            return prompts
+            if enabled:
+                if self.prompts_path.exists() and self.prompts_path.stat().st_size >= COMPRESS_THRESHOLD_BYTES:
+                    self._compress_prompts_file()
+            elif self.compressed_prompts_path.exists():
+                self._decompress_prompts_file()
+        except Exception as e:
+            logger.error(f"Failed to convert project prompts file: {e}")
+
+    def _compress_prompts_file(self) -> None:
+        """Replace prompts.jsonl with prompts.jsonl.zst."""
+        self.close()
+        data = self.prompts_path.read_bytes()
+        tmp_path = self.compressed_prompts_path.with_suffix(".zst.tmp")
+        tmp_path.write_bytes(zstandard.ZstdCompressor(level=3).compress(data))
+        os.replace(tmp_path, self.compressed_prompts_path)
+        self.prompts_path.unlink()
+        _load_prompts.cache_clear()
+        logger.info(f"Compressed prompts for project: {self.name}")
+
+    def _decompress_prompts_file(self) -> None:
+        """Replace prompts.jsonl.zst with prompts.jsonl."""
+        self.close()
+        data = _read_prompts_file(self.compressed_prompts_path)
+        tmp_path = self.prompts_path.with_suffix(".jsonl.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self.prompts_path)
+        self.compressed_prompts_path.unlink()
+        _load_prompts.cache_clear()
+        logger.info(f"Decompressed prompts for project: {self.name}")
+
+    def get_all_prompts(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get all prompts in the project.
 
+        Args:
+            limit: Maximum number of prompts to return (most recent first)
+
+        Returns:
+            List of prompts, most recent first. The prompt dictionaries are
+            shared with an in-memory cache and must not be modified.
+        """
+        prompts_path = self._active_prompts_path()
+        try:
+            stat = prompts_path.stat()
+        except FileNotFoundError:
+            return []
+
+        try:
+            prompts = _load_prompts(str(prompts_path), stat.st_mtime_ns, stat.st_size)
+            return list(prompts[:limit] if limit is not None else prompts)
         except Exception as e:
             logger.error(f"Failed to read project prompts: {e}")
             return []
@@ -131,16 +381,22 @@ class Project:
         Args:
             output_path: Path to output file
         """
-        export_data = {
-            "metadata": self.metadata,
-            "prompts": self.get_all_prompts()
-        }
+        prompts = self.get_all_prompts()
+
+        def nested(obj: Any, depth: int) -> bytes:
+            # Pretty-printed JSON for a value nested `depth` levels deep.
+            # Strings never contain raw newlines, so re-indenting is safe.
+            return json_utils.dumps(obj, indent=True).replace(b"\n", b"\n" + b"  " * depth)
 
         try:
-            output_path.write_text(
-                json.dumps(export_data, indent=2, ensure_ascii=False),
-                encoding="utf-8"
-            )
+            # Same document as dumping {"metadata": ..., "prompts": [...]} with
+            # indent=2, but written one prompt at a time instead of building the
+            # whole file in memory first
+            with open(output_path, "wb") as f:
+                f.write(b'{\n  "metadata": ' + nested(self.metadata, 1) + b',\n  "prompts": [')
+                for i, prompt in enumerate(prompts):
+                    f.write((b",\n    " if i else b"\n    ") + nested(prompt, 2))
+                f.write(b"\n  ]\n}" if prompts else b"]\n}")
             logger.info(f"Exported project to {output_path}")
         except Exception as e:
             logger.error(f"Failed to export project: {e}")
@@ -160,6 +416,18 @@ class ProjectManager:
         self.projects_dir = projects_dir
         self.projects_dir.mkdir(parents=True, exist_ok=True)
 
+    def project_path(self, name: str) -> Path:
+        """
+        Get the directory a project with this name is stored in.
+
+        Args:
+            name: Project name
+
+        Returns:
+            Project directory (which may not exist yet)
+        """
+        return self.projects_dir / _safe_name(name)
+
     def create_project(self, name: str) -> Project:
         """
         Create a new project.
@@ -170,9 +438,7 @@ class ProjectManager:
         Returns:
             New Project instance
         """
-        # Sanitize project name for directory
-        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
-        project_path = self.projects_dir / safe_name
+        project_path = self.project_path(name)
 
         if project_path.exists():
             raise ValueError(f"Project '{name}' already exists")
@@ -189,44 +455,42 @@ class ProjectManager:
         Returns:
             Project instance or None if not found
         """
-        # Sanitize project name
-        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
-        project_path = self.projects_dir / safe_name
+        project_path = self.project_path(name)
 
         if not project_path.exists():
             return None
 
         return Project(name, project_path)
 
-    def list_projects(self) -> List[Dict[str, Any]]:
+    def list_projects(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         List all projects.
 
+        Args:
+            limit: Maximum number of projects to return (most recently created first)
+
         Returns:
             List of project metadata dictionaries
         """
         projects = []
 
-        for project_dir in self.projects_dir.iterdir():
-            if project_dir.is_dir():
-                metadata_path = project_dir / "project.json"
-                if metadata_path.exists():
-                    try:
-                        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
-                        # Add prompt count
-                        prompts_path = project_dir / "prompts.jsonl"
-                        if prompts_path.exists():
-                            with open(prompts_path, "r", encoding="utf-8") as f:
-                                metadata["prompt_count"] = sum(1 for _ in f)
-                        else:
-                            metadata["prompt_count"] = 0
-                        projects.append(metadata)
-                    except Exception:
-                        continue
+        # scandir reports the entry type without a stat() per entry
+        with os.scandir(self.projects_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                project_dir = Path(entry.path)
+                try:
+                    metadata = json_utils.loads((project_dir / "project.json").read_bytes())
+                    # Projects from before prompt_count was tracked
+                    if "prompt_count" not in metadata:
+                        metadata = Project(metadata.get("name", project_dir.name), project_dir).metadata
+                    projects.append(metadata)
+                except Exception:
+                    continue
 
         # Sort by creation date (most recent first)
-        projects.sort(key=lambda x: x.get("created", ""), reverse=True)
-        return projects
+        return _most_recent(projects, "created", limit)
 
     def delete_project(self, name: str) -> bool:
         """
@@ -7,25 +7,53 @@ This module provides security-related functionality including:
 - Rate limiting for API calls
 """
 
-import hashlib
-import hmac
-import json
 import logging
+import os
+import re
+import stat
 import time
-from collections import defaultdict
-from datetime import datetime, timedelta
 from pathlib import Path
 from threading import Lock
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Tuple, Any
 
-try:
-    import keyring
-    KEYRING_AVAILABLE = True
-except ImportError:
-    KEYRING_AVAILABLE = False
+# keyring pulls in platform backends (D-Bus, Security framework bindings) when
+# imported, so it is only imported once a key is actually read or stored
+keyring = None
+NoKeyringError = Exception
+_keyring_loaded = False
+_keyring_lock = Lock()
 
 logger = logging.getLogger(__name__)
 
+# Characters and sequences not allowed in filenames, including C0 control characters
+_DANGEROUS_FILENAME_RE = re.compile(r'[\x00-\x1f/\\:*?"<>|]|\.\.')
+
+# How long keys read from the keyring are reused before asking it again
+KEY_CACHE_TTL_SECONDS = 300
+
+# Consecutive misses in the ImageAI keyring after which it is no longer checked
+IMAGEAI_MAX_MISSES = 3
+
+
+def _load_keyring() -> bool:
+    """
+    Import keyring on first use.
+
+    Returns:
+        True if the keyring library is installed
+    """
+    global keyring, NoKeyringError, _keyring_loaded
+    with _keyring_lock:
+        if not _keyring_loaded:
+            try:
+                import keyring as keyring_module
+                from keyring.errors import NoKeyringError as no_keyring_error
+                keyring, NoKeyringError = keyring_module, no_keyring_error
+            except ImportError:
+                pass
+            _keyring_loaded = True
+    return keyring is not None
+
 
 class PathValidator:
     """Validates file paths to prevent directory traversal attacks."""
@@ -35,6 +63,10 @@ class PathValidator:
         """
         Check if a path is safe (doesn't escape base directory).
 
+        The path itself must not be a symlink, since its target could be
+        swapped between this check and the caller opening it. Paths that
+        don't exist yet are allowed.
+
         Args:
             path: Path to validate
             base_dir: Base directory that path should not escape
@@ -43,17 +75,29 @@ class PathValidator:
             True if path is safe, False otherwise
         """
         try:
-            # Resolve both paths to absolute paths
-            resolved_path = path.resolve()
-            resolved_base = base_dir.resolve()
+            # Look at the path as given before anything resolves it
+            if stat.S_ISLNK(os.lstat(path).st_mode):
+                return False
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            return False
 
-            # Check if the resolved path is within the base directory
-            resolved_path.relative_to(resolved_base)
-            return True
-        except (ValueError, RuntimeError):
-            # Path is outside base directory or resolution failed
+        try:
+            # Resolve both paths to absolute paths (normcase: Windows paths are case-insensitive)
+            resolved_path = os.path.normcase(os.path.realpath(path))
+            resolved_base = os.path.normcase(os.path.realpath(base_dir))
+        except (OSError, ValueError):
+            # Resolution failed
             return False
 
+        # Check if the resolved path is within the base directory
+        if resolved_path == resolved_base:
+            return True
+        if not resolved_base.endswith(os.sep):
+            resolved_base += os.sep
+        return resolved_path.startswith(resolved_base)
+
     @staticmethod
     def validate_filename(filename: str) -> bool:
         """
@@ -65,18 +109,7 @@ class PathValidator:
         Returns:
             True if filename is safe, False otherwise
         """
-        # List of characters that shouldn't be in filenames
-        dangerous_chars = ['..', '/', '\\', '\x00', ':', '*', '?', '"', '<', '>', '|']
-
-        for char in dangerous_chars:
-            if char in filename:
-                return False
-
-        # Check for control characters
-        if any(ord(c) < 32 for c in filename):
-            return False
-
-        return True
+        return _DANGEROUS_FILENAME_RE.search(filename) is None
 
 
 class SecureKeyStorage:
@@ -87,9 +120,51 @@ class SecureKeyStorage:
 
     def __init__(self):
         """Initialize secure key storage."""
-        self.keyring_available = KEYRING_AVAILABLE
-        if not self.keyring_available:
-            logger.info("Keyring library not available. Using file-based storage.")
+        # None until keyring is first needed
+        self._keyring_available: Optional[bool] = None
+
+        # provider -> (monotonic expiry time, key or None if not in the keyring).
+        # Keyring lookups go through the OS credential store and can be slow.
+        self._cache: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._cache_lock = Lock()
+
+        # Whether ImageAI keys exist: None until known, False once it has missed
+        # IMAGEAI_MAX_MISSES times in a row without ever finding a key
+        self._imageai_available: Optional[bool] = None
+        self._imageai_misses = 0
+
+    @property
+    def keyring_available(self) -> bool:
+        """Whether the system keyring can be used, importing keyring on first access."""
+        if self._keyring_available is None:
+            self._keyring_available = _load_keyring()
+            if not self._keyring_available:
+                logger.info("Keyring library not available. Using file-based storage.")
+        return self._keyring_available
+
+    def _cache_key(self, provider: str, key: Optional[str]) -> None:
+        """Remember a keyring lookup result for KEY_CACHE_TTL_SECONDS."""
+        with self._cache_lock:
+            self._cache[provider] = (time.monotonic() + KEY_CACHE_TTL_SECONDS, key)
+
+    def _invalidate(self, provider: str) -> None:
+        """Forget the cached key for a provider."""
+        with self._cache_lock:
+            self._cache.pop(provider, None)
+
+    def _record_imageai_miss(self) -> None:
+        """Stop checking the ImageAI keyring after repeated misses, unless it has had keys."""
+        if self._imageai_available:
+            return
+        self._imageai_misses += 1
+        if self._imageai_misses >= IMAGEAI_MAX_MISSES:
+            logger.debug("No keys found in ImageAI keyring; no longer checking it")
+            self._imageai_available = False
+
+    def _mark_keyring_unusable(self, exc: Exception) -> None:
+        """Stop using keyring for this session after the backend reports none is usable."""
+        logger.info(f"No usable keyring backend ({exc}). Using file-based storage.")
+        self._keyring_available = False
 
     def store_key(self, provider: str, key: str) -> bool:
         """
@@ -105,6 +180,7 @@ class SecureKeyStorage:
         if not self.keyring_available:
             return False
 
+        self._invalidate(provider)
         try:
             keyring.set_password(
                 self.SERVICE_NAME,
@@ -113,6 +189,9 @@ class SecureKeyStorage:
             )
             logger.info(f"API key for {provider} stored in system keyring")
             return True
+        except NoKeyringError as e:
+            self._mark_keyring_unusable(e)
+            return False
         except Exception as e:
             logger.warning(f"Failed to store key in keyring: {e}")
             return False
@@ -121,7 +200,8 @@ class SecureKeyStorage:
         """
         Retrieve an API key from secure storage.
 
-        Also checks ImageAI keyring for import compatibility.
+        Also checks ImageAI keyring for import compatibility. Results are
+        cached for KEY_CACHE_TTL_SECONDS.
 
         Args:
             provider: Provider name (e.g., 'openai', 'anthropic')
@@ -132,6 +212,11 @@ class SecureKeyStorage:
         if not self.keyring_available:
             return None
 
+        with self._cache_lock:
+            cached = self._cache.get(provider)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+
         try:
             # Try PromptAlchemy keyring first
             key = keyring.get_password(
@@ -140,19 +225,28 @@ class SecureKeyStorage:
             )
             if key:
                 logger.debug(f"Retrieved API key for {provider} from keyring")
+                self._cache_key(provider, key)
                 return key
 
             # If not found, try ImageAI keyring (for import)
-            key = keyring.get_password(
-                self.IMAGEAI_SERVICE_NAME,
-                f"{provider}_api_key"
-            )
-            if key:
-                logger.info(f"Retrieved API key for {provider} from ImageAI keyring")
-                # Store it in our keyring for future use
-                self.store_key(provider, key)
-                return key
-
+            if self._imageai_available is not False:
+                key = keyring.get_password(
+                    self.IMAGEAI_SERVICE_NAME,
+                    f"{provider}_api_key"
+                )
+                if key:
+                    logger.info(f"Retrieved API key for {provider} from ImageAI keyring")
+                    self._imageai_available = True
+                    # Store it in our keyring for future use
+                    self.store_key(provider, key)
+                    self._cache_key(provider, key)
+                    return key
+                self._record_imageai_miss()
+
+            self._cache_key(provider, None)
+            return None
+        except NoKeyringError as e:
+            self._mark_keyring_unusable(e)
             return None
         except Exception as e:
             logger.debug(f"Failed to retrieve key from keyring: {e}")
@@ -171,6 +265,7 @@ class SecureKeyStorage:
         if not self.keyring_available:
             return False
 
+        self._invalidate(provider)
         try:
             keyring.delete_password(
                 self.SERVICE_NAME,
@@ -184,12 +279,18 @@ class SecureKeyStorage:
 
 
 class RateLimiter:
-    """Implements rate limiting for API calls."""
+    """Implements rate limiting for API calls using a token bucket per provider."""
 
     def __init__(self):
         """Initialize rate limiter."""
-        self._call_history: Dict[str, list] = defaultdict(list)
-        self._lock = Lock()
+        # provider -> [tokens, last refill time, capacity, tokens per second].
+        # The limit is copied into the bucket so checks don't look it up.
+        self._buckets: Dict[str, List[float]] = {}
+
+        # One lock per provider so unrelated providers never wait on each other;
+        # _locks_guard only protects creating them
+        self._locks: Dict[str, Lock] = {}
+        self._locks_guard = Lock()
 
         # Default rate limits per provider
         self._limits = {
@@ -211,6 +312,48 @@ class RateLimiter:
         """
         self._limits[provider] = {'calls': calls, 'window': window}
 
+        # Update buckets already using this limit, keeping their tokens
+        affected = [
+            name for name in list(self._buckets)
+            if name == provider or (provider == 'default' and name not in self._limits)
+        ]
+        for name in affected:
+            with self._provider_lock(name):
+                bucket = self._buckets[name]
+                bucket[0] = min(bucket[0], calls)
+                bucket[2] = calls
+                bucket[3] = calls / window
+
+    def _provider_lock(self, provider: str) -> Lock:
+        """Get the lock for a provider, creating it on first use."""
+        lock = self._locks.get(provider)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(provider, Lock())
+        return lock
+
+    def _refill(self, provider: str, now: float) -> List[float]:
+        """
+        Top up a provider's bucket for the time elapsed since its last refill.
+
+        Must be called with the provider's lock held.
+
+        Returns:
+            The provider's bucket
+        """
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            # A provider starts with its full allowance
+            limits = self._limits.get(provider, self._limits['default'])
+            max_calls = limits['calls']
+            bucket = [float(max_calls), now, max_calls, max_calls / limits['window']]
+            self._buckets[provider] = bucket
+        else:
+            tokens, last, capacity, rate = bucket
+            bucket[0] = min(capacity, tokens + (now - last) * rate)
+            bucket[1] = now
+        return bucket
+
     def check_rate_limit(self, provider: str, wait: bool = True) -> bool:
         """
         Check if an API call is within rate limits.
@@ -222,77 +365,43 @@ class RateLimiter:
         Returns:
             True if call is allowed, False if rate limited
         """
-        with self._lock:
-            now = time.time()
+        with self._provider_lock(provider):
+            bucket = self._refill(provider, time.monotonic())
 
-            # Get limits for this provider
-            limits = self._limits.get(provider, self._limits['default'])
-            max_calls = limits['calls']
-            window = limits['window']
-
-            # Clean old entries
-            cutoff = now - window
-            self._call_history[provider] = [
-                t for t in self._call_history[provider] if t > cutoff
-            ]
-
-            # Check if we're at the limit
-            if len(self._call_history[provider]) >= max_calls:
-                if not wait:
-                    return False
-
-                # Calculate wait time
-                oldest_call = min(self._call_history[provider])
-                wait_time = window - (now - oldest_call) + 0.1
-
-                if wait_time > 0:
-                    logger.info(f"Rate limit reached for {provider}. Waiting {wait_time:.1f}s...")
-                    time.sleep(wait_time)
-
-                    # Clean again after waiting
-                    now = time.time()
-                    cutoff = now - window
-                    self._call_history[provider] = [
-                        t for t in self._call_history[provider] if t > cutoff
-                    ]
-
-            # Record this call
-            self._call_history[provider].append(now)
-            return True
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True
+
+            if not wait:
+                return False
+
+            # Reserve the next token now, leaving the bucket in debt, so the
+            # lock isn't held while sleeping. Later callers queue up behind
+            # the debt and wait correspondingly longer.
+            bucket[0] -= 1
+            wait_time = -bucket[0] / bucket[3]
+
+        logger.info(f"Rate limit reached for {provider}. Waiting {wait_time:.1f}s...")
+        time.sleep(wait_time)
+        return True
 
     def get_remaining_calls(self, provider: str) -> tuple[int, float]:
         """
-        Get remaining calls and time until reset.
+        Get remaining calls and time until the next call is allowed.
 
         Args:
             provider: Provider name
 
         Returns:
-            Tuple of (remaining calls, seconds until reset)
+            Tuple of (remaining calls, seconds until a call is allowed)
         """
-        with self._lock:
-            now = time.time()
-
-            # Get limits for this provider
-            limits = self._limits.get(provider, self._limits['default'])
-            max_calls = limits['calls']
-            window = limits['window']
-
-            # Clean old entries
-            cutoff = now - window
-            self._call_history[provider] = [
-                t for t in self._call_history[provider] if t > cutoff
-            ]
-
-            remaining = max_calls - len(self._call_history[provider])
-
-            if self._call_history[provider]:
-                oldest_call = min(self._call_history[provider])
-                reset_time = window - (now - oldest_call)
-            else:
-                reset_time = 0
+        with self._provider_lock(provider):
+            bucket = self._refill(provider, time.monotonic())
+            tokens = bucket[0]
 
-            return remaining, max(0, reset_time)
+            if tokens >= 1:
+                return int(tokens), 0.0
+            return 0, (1 - tokens) / bucket[3]
 
 
 # Global instances
@@ -1,19 +1,22 @@
 """Main window for PromptAlchemy GUI."""
 
+import asyncio
 import sys
 import logging
+import threading
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
-    QTextEdit, QPlainTextEdit, QPushButton, QLabel, QComboBox, QCheckBox,
+    QPlainTextEdit, QPushButton, QLabel, QComboBox, QCheckBox,
     QLineEdit, QGroupBox, QListWidget, QListWidgetItem, QFileDialog,
     QMessageBox, QProgressDialog, QSpinBox, QDoubleSpinBox, QFormLayout,
-    QSplitter, QFrame, QTableWidget, QTableWidgetItem, QHeaderView,
+    QSplitter, QFrame, QTableView, QListView, QAbstractItemView, QHeaderView,
     QApplication
 )
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QObject, QTimer, Signal, Slot
 from PySide6.QtGui import QFont, QTextCursor, QShortcut, QKeySequence
 
 # Add parent directory to path for imports
@@ -26,27 +29,76 @@ from core.projects import ProjectManager
 from core.llm_models import get_all_provider_ids, get_provider_models, get_provider_display_name
 from core.constants import REASONING_MODES, VERBOSITY_LEVELS, TOOL_OPTIONS, DEFAULT_ROLES
 from core.version import __version__
+from gui.models import HistoryTableModel, PromptListModel
 from gui.tabs.help_tab import HelpTab
 
 logger = logging.getLogger(__name__)
 
+# History files larger than this (roughly 500 entries) are searched on the
+# background loop so filtering doesn't stall the GUI thread
+ASYNC_HISTORY_SEARCH_BYTES = 1024 * 1024
 
-class EnhanceWorker(QThread):
-    """Background worker for prompt enhancement."""
-    finished = Signal(dict)
-    error = Signal(str)
 
-    def __init__(self, enhancer: PromptEnhancer, **kwargs):
-        super().__init__()
-        self.enhancer = enhancer
-        self.kwargs = kwargs
+class EnhanceSignals(QObject):
+    """
+    Delivers the outcome of an enhancement coroutine to the GUI thread.
 
-    def run(self):
-        try:
-            result = self.enhancer.enhance_prompt(**self.kwargs)
-            self.finished.emit(result)
-        except Exception as e:
-            self.error.emit(str(e))
+    Both signals carry the future they report on, so a result queued before
+    a cancel can't be taken for the outcome of a newer request.
+    """
+    # Declared as object so the result dict is passed by reference rather
+    # than converted to a QVariantMap and back
+    finished = Signal(object, object)
+    error = Signal(object, str)
+
+    def emit_outcome(self, future: Future) -> None:
+        """Emit finished or error for a completed future (nothing if cancelled)."""
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            self.error.emit(future, str(exc))
+        else:
+            self.finished.emit(future, future.result())
+
+
+class HistorySearchSignals(QObject):
+    """Delivers background history search results to the GUI thread."""
+    # object rather than list, so entries aren't converted to QVariants
+    results_ready = Signal(int, object)
+
+    def emit_outcome(self, generation: int, future: Future) -> None:
+        """Emit results_ready for a completed search (nothing if it failed)."""
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            logger.error(f"History search failed: {exc}")
+        else:
+            self.results_ready.emit(generation, future.result())
+
+
+class AsyncRunner:
+    """
+    Runs coroutines on one asyncio event loop in a background thread.
+
+    LLM calls are I/O bound, so they are awaited on a single long-lived loop
+    instead of each occupying a thread.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="asyncio-runner", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine; cancelling the returned future cancels it."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def stop(self) -> None:
+        """Stop the event loop and wait briefly for its thread to exit."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2)
 
 
 class PromptAlchemyMainWindow(QMainWindow):
@@ -58,6 +110,22 @@ class PromptAlchemyMainWindow(QMainWindow):
         self.enhancer = PromptEnhancer(self.config)
         self.history_manager = HistoryManager(self.config.get_history_path())
         self.project_manager = ProjectManager(self.config.get_projects_dir())
+        self._provider_ids = get_all_provider_ids()
+
+        # API keys already read from keyring/config; filled on first use so
+        # startup doesn't touch the keyring, and updated by save_api_key
+        self._api_key_cache: Dict[str, Optional[str]] = {}
+
+        # Enhancements run as coroutines on a background event loop
+        self.async_runner = AsyncRunner()
+        self._enhance_future: Optional[Future] = None
+        self._enhance_signals: Optional[EnhanceSignals] = None
+
+        # Created on the GUI thread so its slots run there; the generation
+        # lets stale background search results be dropped
+        self._history_signals = HistorySearchSignals(self)
+        self._history_signals.results_ready.connect(self._on_history_results)
+        self._history_generation = 0
 
         self.init_ui()
         self.load_ui_state()
@@ -76,16 +144,41 @@ class PromptAlchemyMainWindow(QMainWindow):
         self.tabs = QTabWidget()
         layout.addWidget(self.tabs)
 
-        # Create tabs
+        # Create tabs. History, Projects and Settings read history, projects
+        # and stored keys when built, so they start as placeholders and are
+        # built the first time they are shown.
         self.create_enhance_tab()
-        self.create_history_tab()
-        self.create_projects_tab()
-        self.create_settings_tab()
+        self._tab_builders = {}
+        for title, builder in (
+            ("History", self.create_history_tab),
+            ("Projects", self.create_projects_tab),
+            ("Settings", self.create_settings_tab),
+        ):
+            self._tab_builders[self.tabs.addTab(QWidget(), title)] = builder
         self.create_help_tab()
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
 
         # Add global hotkeys
         self.setup_hotkeys()
 
+    @Slot(int)
+    def _ensure_tab_built(self, index: int):
+        """Replace a placeholder tab with the real one the first time it is shown."""
+        builder = self._tab_builders.pop(index, None)
+        if builder is None:
+            return
+
+        title = self.tabs.tabText(index)
+        placeholder = self.tabs.widget(index)
+        self.tabs.blockSignals(True)
+        try:
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, builder(), title)
+            self.tabs.setCurrentIndex(index)
+        finally:
+            self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+
     def create_enhance_tab(self):
         """Create the main enhancement tab."""
         tab = QWidget()
@@ -103,7 +196,7 @@ class PromptAlchemyMainWindow(QMainWindow):
         provider_layout = QHBoxLayout()
         self.provider_combo = QComboBox()
         self.provider_combo.setToolTip("Select the LLM provider (OpenAI, Anthropic, Google, etc.)")
-        for provider_id in get_all_provider_ids():
+        for provider_id in self._provider_ids:
             self.provider_combo.addItem(get_provider_display_name(provider_id), provider_id)
         self.provider_combo.currentIndexChanged.connect(self.on_provider_changed)
         provider_layout.addWidget(self.provider_combo)
@@ -287,7 +380,7 @@ class PromptAlchemyMainWindow(QMainWindow):
         # Enhanced Output
         output_group = QGroupBox("Enhanced Prompt")
         output_layout = QVBoxLayout()
-        self.enhanced_output = QTextEdit()
+        self.enhanced_output = QPlainTextEdit()
         self.enhanced_output.setReadOnly(True)
         output_layout.addWidget(self.enhanced_output)
         output_group.setLayout(output_layout)
@@ -340,13 +433,18 @@ class PromptAlchemyMainWindow(QMainWindow):
         filter_layout.addWidget(QLabel("Search:"))
         self.history_search = QLineEdit()
         self.history_search.setPlaceholderText("Search prompts...")
-        self.history_search.textChanged.connect(self.refresh_history)
+        # Refresh once typing pauses rather than on every keystroke
+        self._history_debounce = QTimer(self)
+        self._history_debounce.setSingleShot(True)
+        self._history_debounce.setInterval(250)
+        self._history_debounce.timeout.connect(self.refresh_history)
+        self.history_search.textChanged.connect(lambda _: self._history_debounce.start())
         filter_layout.addWidget(self.history_search)
 
         filter_layout.addWidget(QLabel("Provider:"))
         self.history_provider_filter = QComboBox()
         self.history_provider_filter.addItem("All", None)
-        for provider_id in get_all_provider_ids():
+        for provider_id in self._provider_ids:
             self.history_provider_filter.addItem(get_provider_display_name(provider_id), provider_id)
         self.history_provider_filter.currentIndexChanged.connect(self.refresh_history)
         filter_layout.addWidget(self.history_provider_filter)
@@ -361,18 +459,19 @@ class PromptAlchemyMainWindow(QMainWindow):
         layout.addLayout(filter_layout)
 
         # History table
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(4)
-        self.history_table.setHorizontalHeaderLabels(["Timestamp", "Provider/Model", "Original Prompt", "Tokens"])
+        # Rows are drawn from the model on demand; no per-cell items
+        self.history_model = HistoryTableModel(self)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
         self.history_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
-        self.history_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.history_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.history_table.doubleClicked.connect(self.load_history_entry)
         layout.addWidget(self.history_table)
 
         # Details preview
         details_group = QGroupBox("Selected Entry")
         details_layout = QVBoxLayout()
-        self.history_details = QTextEdit()
+        self.history_details = QPlainTextEdit()
         self.history_details.setReadOnly(True)
         self.history_details.setMaximumHeight(150)
         details_layout.addWidget(self.history_details)
@@ -391,10 +490,9 @@ class PromptAlchemyMainWindow(QMainWindow):
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
 
-        self.tabs.addTab(tab, "History")
-
-        # Load history on startup
+        # Load history
         self.refresh_history()
+        return tab
 
     def create_projects_tab(self):
         """Create the projects management tab."""
@@ -434,7 +532,9 @@ class PromptAlchemyMainWindow(QMainWindow):
         details_layout.addWidget(self.project_desc_label)
 
         details_layout.addWidget(QLabel("Prompts in Project:"))
-        self.project_prompts_list = QListWidget()
+        self.project_prompts_model = PromptListModel(self)
+        self.project_prompts_list = QListView()
+        self.project_prompts_list.setModel(self.project_prompts_model)
         self.project_prompts_list.doubleClicked.connect(self.load_project_prompt)
         details_layout.addWidget(self.project_prompts_list)
 
@@ -444,10 +544,9 @@ class PromptAlchemyMainWindow(QMainWindow):
 
         layout.addLayout(details_layout, 2)
 
-        self.tabs.addTab(tab, "Projects")
-
         # Load projects
         self.refresh_projects()
+        return tab
 
     def create_settings_tab(self):
         """Create the settings tab."""
@@ -459,14 +558,14 @@ class PromptAlchemyMainWindow(QMainWindow):
         api_layout = QFormLayout()
 
         self.api_key_widgets = {}
-        for provider_id in get_all_provider_ids():
+        for provider_id in self._provider_ids:
             key_layout = QHBoxLayout()
             key_edit = QLineEdit()
             key_edit.setEchoMode(QLineEdit.Password)
             key_edit.setPlaceholderText(f"Enter {get_provider_display_name(provider_id)} API key...")
 
             # Load existing key
-            existing_key = self.config.get_api_key(provider_id)
+            existing_key = self._get_api_key(provider_id)
             if existing_key:
                 key_edit.setText(existing_key)
 
@@ -576,7 +675,7 @@ class PromptAlchemyMainWindow(QMainWindow):
         layout.addWidget(defaults_group)
 
         layout.addStretch()
-        self.tabs.addTab(tab, "Settings")
+        return tab
 
     def create_help_tab(self):
         """Create the help documentation tab."""
@@ -653,6 +752,7 @@ class PromptAlchemyMainWindow(QMainWindow):
         # Apply current sort
         self.sort_roles(self.role_sort_combo.currentText() if hasattr(self, 'role_sort_combo') else "Name ↑")
 
+    @Slot(str)
     def sort_roles(self, sort_mode: str = "Name ↑"):
         """Sort roles based on the selected mode."""
         if not hasattr(self, 'all_roles'):
@@ -680,6 +780,7 @@ class PromptAlchemyMainWindow(QMainWindow):
             if index >= 0:
                 self.role_combo.setCurrentIndex(index)
 
+    @Slot()
     def add_custom_role(self):
         """Add current role to custom roles list."""
         from datetime import datetime
@@ -716,6 +817,7 @@ class PromptAlchemyMainWindow(QMainWindow):
 
         QMessageBox.information(self, "Success", f"Role '{role_text}' added to custom roles!")
 
+    @Slot(int)
     def on_provider_changed(self, index):
         """Handle provider selection change."""
         provider_id = self.provider_combo.currentData()
@@ -725,17 +827,20 @@ class PromptAlchemyMainWindow(QMainWindow):
         for model in models:
             self.model_combo.addItem(model)
 
+    @Slot()
     def add_attachments(self):
         """Add file attachments."""
         files, _ = QFileDialog.getOpenFileNames(self, "Select Files to Attach")
         for file_path in files:
             self.attachments_list.addItem(file_path)
 
+    @Slot()
     def remove_attachments(self):
         """Remove selected attachments."""
         for item in self.attachments_list.selectedItems():
             self.attachments_list.takeItem(self.attachments_list.row(item))
 
+    @Slot()
     def enhance_prompt(self):
         """Enhance the prompt."""
         prompt = self.prompt_input.toPlainText().strip()
@@ -749,7 +854,7 @@ class PromptAlchemyMainWindow(QMainWindow):
         # Check authentication (API key or cloud auth)
         auth_mode = self.config.get_auth_mode(provider_id)
         if auth_mode == "api-key":
-            if not self.config.get_api_key(provider_id):
+            if not self._get_api_key(provider_id):
                 QMessageBox.warning(self, "Error", f"API key for {get_provider_display_name(provider_id)} not configured. Please set it in Settings tab.")
                 return
         elif auth_mode == "gcloud":
@@ -779,18 +884,7 @@ class PromptAlchemyMainWindow(QMainWindow):
         for i in range(self.attachments_list.count()):
             attachments.append(Path(self.attachments_list.item(i).text()))
 
-        # Disable button
-        self.enhance_btn.setEnabled(False)
-        self.enhance_btn.setText("Enhancing...")
-
-        # Create progress dialog
-        self.progress = QProgressDialog("Enhancing prompt...", None, 0, 0, self)
-        self.progress.setWindowModality(Qt.WindowModal)
-        self.progress.show()
-
-        # Start worker thread
-        self.worker = EnhanceWorker(
-            self.enhancer,
+        request = dict(
             original_prompt=prompt,
             provider=provider_id,
             model=model,
@@ -804,37 +898,88 @@ class PromptAlchemyMainWindow(QMainWindow):
             deliverables=deliverables,
             attachments=attachments if attachments else None
         )
-        self.worker.finished.connect(self.on_enhancement_complete)
-        self.worker.error.connect(self.on_enhancement_error)
-        self.worker.start()
 
-    def on_enhancement_complete(self, result: Dict[str, Any]):
+        # Disable button
+        self.enhance_btn.setEnabled(False)
+        self.enhance_btn.setText("Enhancing...")
+
+        # Create progress dialog
+        self.progress = QProgressDialog("Enhancing prompt...", "Cancel", 0, 0, self)
+        self.progress.setWindowModality(Qt.WindowModal)
+        self.progress.canceled.connect(self.cancel_enhancement)
+        self.progress.show()
+
+        # Created here on the GUI thread, so the slots run on it
+        signals = EnhanceSignals()
+        signals.finished.connect(self.on_enhancement_complete)
+        signals.error.connect(self.on_enhancement_error)
+
+        future = self.async_runner.submit(self.enhancer.aenhance_prompt(**request))
+        future.add_done_callback(signals.emit_outcome)
+        self._enhance_future = future
+        self._enhance_signals = signals
+
+    @Slot()
+    def cancel_enhancement(self):
+        """Cancel the running enhancement, if any."""
+        if self._enhance_future is None:
+            return
+        self._enhance_future.cancel()
+        self._enhance_future = None
+        self._enhance_signals = None
+        self.progress.close()
+        self.enhance_btn.setEnabled(True)
+        self.enhance_btn.setText("Enhance Prompt")
+
+    @Slot(object, object)
+    def on_enhancement_complete(self, future: Future, result: Dict[str, Any]):
         """Handle enhancement completion."""
+        if future is not self._enhance_future:
+            # Cancelled after the result was already on its way
+            return
+        self._enhance_future = None
+        self._enhance_signals = None
         self.progress.close()
         self.enhance_btn.setEnabled(True)
         self.enhance_btn.setText("Enhance Prompt")
+        self.show_enhancement_result(result)
 
+    def show_enhancement_result(self, result: Dict[str, Any]):
+        """Display an enhancement result and record it in history."""
         self.enhanced_output.setPlainText(result['enhanced_prompt'])
         self.current_result = result
 
-        # Save to history
-        self.history_manager.add_entry(result)
+        # Save to history; results reused from the response cache are
+        # already there from the request that produced them
+        if not result.get('cache_hit'):
+            self.history_manager.add_entry(result)
 
         # Show success message
-        tokens = result.get('tokens_used', 'unknown')
-        QMessageBox.information(self, "Success", f"Prompt enhanced successfully!\nTokens used: {tokens}")
+        if result.get('cache_hit'):
+            similar = "a near-identical" if result['cache_hit'] == "near" else "an identical"
+            message = f"Prompt enhanced successfully!\n(Reused the result of {similar} earlier request)"
+        else:
+            message = f"Prompt enhanced successfully!\nTokens used: {result.get('tokens_used', 'unknown')}"
+        QMessageBox.information(self, "Success", message)
 
         # Refresh history
-        self.refresh_history()
+        if not result.get('cache_hit'):
+            self.refresh_history()
 
-    def on_enhancement_error(self, error: str):
+    @Slot(object, str)
+    def on_enhancement_error(self, future: Future, error: str):
         """Handle enhancement error."""
+        if future is not self._enhance_future:
+            return
+        self._enhance_future = None
+        self._enhance_signals = None
         logger.error(f"Enhancement error in UI: {error}")
         self.progress.close()
         self.enhance_btn.setEnabled(True)
         self.enhance_btn.setText("Enhance Prompt")
         QMessageBox.critical(self, "Error", f"Enhancement failed:\n{error}")
 
+    @Slot()
     def copy_enhanced(self):
         """Copy enhanced prompt to clipboard."""
         text = self.enhanced_output.toPlainText()
@@ -842,6 +987,7 @@ class PromptAlchemyMainWindow(QMainWindow):
             QApplication.clipboard().setText(text)
             QMessageBox.information(self, "Copied", "Enhanced prompt copied to clipboard!")
 
+    @Slot()
     def save_enhanced(self):
         """Save enhanced prompt to file."""
         text = self.enhanced_output.toPlainText()
@@ -854,6 +1000,7 @@ class PromptAlchemyMainWindow(QMainWindow):
             Path(file_path).write_text(text, encoding='utf-8')
             QMessageBox.information(self, "Saved", f"Enhanced prompt saved to {file_path}")
 
+    @Slot()
     def save_to_project(self):
         """Save current result to a project."""
         if not hasattr(self, 'current_result'):
@@ -872,50 +1019,62 @@ class PromptAlchemyMainWindow(QMainWindow):
             QMessageBox.information(self, "Saved", f"Saved to project: {project_name}")
             self.refresh_projects()
 
+    @Slot()
     def refresh_history(self):
         """Refresh history table."""
+        if not hasattr(self, 'history_table'):
+            # History tab not built yet; it loads history when it is
+            return
+
+        # Covers any search refresh still pending
+        self._history_debounce.stop()
+
         query = self.history_search.text() or None
         provider = self.history_provider_filter.currentData()
 
-        entries = self.history_manager.search_entries(query=query, provider=provider)
+        self._history_generation += 1
+        generation = self._history_generation
 
-        self.history_table.setRowCount(len(entries))
-        for i, entry in enumerate(entries):
-            self.history_table.setItem(i, 0, QTableWidgetItem(entry.get('timestamp', '')))
-            self.history_table.setItem(i, 1, QTableWidgetItem(f"{entry.get('provider')}/{entry.get('model')}"))
+        try:
+            history_size = self.history_manager.history_path.stat().st_size
+        except OSError:
+            history_size = 0
 
-            prompt_preview = entry.get('original_prompt', '')[:100].replace('\n', ' ')
-            self.history_table.setItem(i, 2, QTableWidgetItem(prompt_preview))
+        if history_size <= ASYNC_HISTORY_SEARCH_BYTES:
+            entries = self.history_manager.search_entries(query=query, provider=provider)
+            self.history_model.set_entries(entries)
+            return
 
-            tokens = str(entry.get('tokens_used', 'N/A'))
-            self.history_table.setItem(i, 3, QTableWidgetItem(tokens))
+        future = self.async_runner.submit(
+            asyncio.to_thread(self.history_manager.search_entries, query=query, provider=provider)
+        )
+        future.add_done_callback(lambda f: self._history_signals.emit_outcome(generation, f))
 
+    @Slot(int, object)
+    def _on_history_results(self, generation: int, entries: list):
+        """Show background search results unless a newer search has started."""
+        if generation == self._history_generation:
+            self.history_model.set_entries(entries)
+
+    @Slot()
     def load_history_entry(self):
         """Load selected history entry to details."""
-        row = self.history_table.currentRow()
-        if row < 0:
-            return
-
-        entries = self.history_manager.get_all_entries()
-        if row < len(entries):
-            entry = entries[row]
+        entry = self.history_model.entry(self.history_table.currentIndex().row())
+        if entry is not None:
             details = f"Original Prompt:\n{entry.get('original_prompt', '')}\n\n"
             details += f"Enhanced Prompt:\n{entry.get('enhanced_prompt', '')}"
             self.history_details.setPlainText(details)
 
+    @Slot()
     def load_history_to_enhance(self):
         """Load history entry to enhance tab."""
-        row = self.history_table.currentRow()
-        if row < 0:
-            return
-
-        entries = self.history_manager.get_all_entries()
-        if row < len(entries):
-            entry = entries[row]
+        entry = self.history_model.entry(self.history_table.currentIndex().row())
+        if entry is not None:
             self.prompt_input.setPlainText(entry.get('original_prompt', ''))
             self.enhanced_output.setPlainText(entry.get('enhanced_prompt', ''))
             self.tabs.setCurrentIndex(0)
 
+    @Slot()
     def clear_history(self):
         """Clear all history."""
         reply = QMessageBox.question(self, "Clear History", "Are you sure you want to clear all history?",
@@ -924,6 +1083,7 @@ class PromptAlchemyMainWindow(QMainWindow):
             self.history_manager.clear_history()
             self.refresh_history()
 
+    @Slot()
     def export_history(self):
         """Export history to file."""
         file_path, _ = QFileDialog.getSaveFileName(self, "Export History", "history.json",
@@ -935,6 +1095,10 @@ class PromptAlchemyMainWindow(QMainWindow):
 
     def refresh_projects(self):
         """Refresh projects list."""
+        if not hasattr(self, 'projects_list'):
+            # Projects tab not built yet; it loads projects when it is
+            return
+
         self.projects_list.clear()
         projects = self.project_manager.list_projects()
 
@@ -949,6 +1113,7 @@ class PromptAlchemyMainWindow(QMainWindow):
                 item.setData(Qt.UserRole, project)
                 self.projects_list.addItem(item)
 
+    @Slot(QListWidgetItem, QListWidgetItem)
     def on_project_selected(self, current, previous):
         """Handle project selection."""
         if not current:
@@ -961,14 +1126,9 @@ class PromptAlchemyMainWindow(QMainWindow):
             self.project_name_label.setText(project.name)
             self.project_desc_label.setText(project.metadata.get('description', 'No description'))
 
-            self.project_prompts_list.clear()
-            prompts = project.get_all_prompts()
-            for prompt in prompts:
-                preview = prompt.get('original_prompt', '')[:80].replace('\n', ' ')
-                item = QListWidgetItem(f"{prompt.get('timestamp', 'Unknown')}: {preview}...")
-                item.setData(Qt.UserRole, prompt)
-                self.project_prompts_list.addItem(item)
+            self.project_prompts_model.set_prompts(project.get_all_prompts())
 
+    @Slot()
     def create_project(self):
         """Create a new project."""
         from PySide6.QtWidgets import QInputDialog
@@ -981,6 +1141,7 @@ class PromptAlchemyMainWindow(QMainWindow):
             except ValueError as e:
                 QMessageBox.warning(self, "Error", str(e))
 
+    @Slot()
     def delete_project(self):
         """Delete selected project."""
         current = self.projects_list.currentItem()
@@ -995,15 +1156,16 @@ class PromptAlchemyMainWindow(QMainWindow):
             self.project_manager.delete_project(project_data['name'])
             self.refresh_projects()
 
+    @Slot()
     def load_project_prompt(self):
         """Load project prompt to enhance tab."""
-        item = self.project_prompts_list.currentItem()
-        if item:
-            prompt_data = item.data(Qt.UserRole)
+        prompt_data = self.project_prompts_model.prompt(self.project_prompts_list.currentIndex().row())
+        if prompt_data is not None:
             self.prompt_input.setPlainText(prompt_data.get('original_prompt', ''))
             self.enhanced_output.setPlainText(prompt_data.get('enhanced_prompt', ''))
             self.tabs.setCurrentIndex(0)
 
+    @Slot()
     def export_project(self):
         """Export selected project."""
         current = self.projects_list.currentItem()
@@ -1020,16 +1182,25 @@ class PromptAlchemyMainWindow(QMainWindow):
                 project.export(Path(file_path))
                 QMessageBox.information(self, "Exported", f"Project exported to {file_path}")
 
+    def _get_api_key(self, provider: str) -> Optional[str]:
+        """Get a provider's API key, reading keyring/config only the first time."""
+        if provider not in self._api_key_cache:
+            self._api_key_cache[provider] = self.config.get_api_key(provider)
+        return self._api_key_cache[provider]
+
+    @Slot(str, str)
     def save_api_key(self, provider: str, key: str):
         """Save API key for provider."""
         if key.strip():
             logger.info(f"Saving API key for provider: {provider}")
             self.config.set_api_key(provider, key)
             self.config.save()
+            self._api_key_cache[provider] = key
             QMessageBox.information(self, "Saved", f"API key saved for {get_provider_display_name(provider)}")
         else:
             logger.warning(f"Attempted to save empty API key for provider: {provider}")
 
+    @Slot()
     def save_defaults(self):
         """Save default settings."""
         defaults = {
@@ -1044,6 +1215,7 @@ class PromptAlchemyMainWindow(QMainWindow):
         self.config.save()
         QMessageBox.information(self, "Saved", "Default settings saved!")
 
+    @Slot(str)
     def on_auth_mode_changed(self, text: str):
         """Handle authentication mode change."""
         try:
@@ -1068,13 +1240,14 @@ class PromptAlchemyMainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"Error in on_auth_mode_changed: {e}", exc_info=True)
 
+    @Slot()
     def check_gcloud_status(self):
         """Check Google Cloud authentication status."""
         from core.gcloud_utils import check_gcloud_auth_status, get_gcloud_project_id
 
         self.gcloud_status_label.setText("Checking...")
 
-        is_authed, status_msg = check_gcloud_auth_status()
+        is_authed, status_msg = check_gcloud_auth_status(use_cache=False)
 
         if is_authed:
             self.gcloud_status_label.setText(f"✓ {status_msg}")
@@ -1186,4 +1359,8 @@ class PromptAlchemyMainWindow(QMainWindow):
             "meta_fix": self.meta_fix_check.isChecked()
         }
         self.config.save_ui_state(state)
+        self.cancel_enhancement()
+        # Before stopping the runner: the async HTTP session closes on its loop
+        self.enhancer.close()
+        self.async_runner.stop()
         event.accept()
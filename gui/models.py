@@ -0,0 +1,97 @@
+"""Item models backing PromptAlchemy's history table and prompt lists."""
+
+from typing import Any, Dict, Optional, Sequence
+
+from PySide6.QtCore import Qt, QAbstractListModel, QAbstractTableModel, QModelIndex
+
+
+def _one_line(text: str) -> str:
+    """Flatten line breaks and tabs to spaces for single-line previews."""
+    # Chained str.replace beats str.translate here: it returns the string
+    # unchanged in C when there is nothing to replace
+    return text.replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
+
+
+class PromptListModel(QAbstractListModel):
+    """
+    Enhancement records shown one per row as "timestamp: prompt preview...".
+
+    The records are held as given, not copied; previews are only built for
+    rows the view actually displays.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._prompts: Sequence[Dict[str, Any]] = ()
+
+    def set_prompts(self, prompts: Sequence[Dict[str, Any]]) -> None:
+        """Replace all rows."""
+        self.beginResetModel()
+        self._prompts = prompts
+        self.endResetModel()
+
+    def prompt(self, row: int) -> Optional[Dict[str, Any]]:
+        """Get the record shown in a row, or None if the row doesn't exist."""
+        if 0 <= row < len(self._prompts):
+            return self._prompts[row]
+        return None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._prompts)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        prompt = self._prompts[index.row()]
+        if role == Qt.DisplayRole:
+            preview = _one_line(prompt.get('original_prompt', '')[:80])
+            return f"{prompt.get('timestamp', 'Unknown')}: {preview}..."
+        if role == Qt.UserRole:
+            return prompt
+        return None
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """History entries shown as timestamp, provider/model, prompt preview and tokens."""
+
+    HEADERS = ("Timestamp", "Provider/Model", "Original Prompt", "Tokens")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries: Sequence[Dict[str, Any]] = ()
+
+    def set_entries(self, entries: Sequence[Dict[str, Any]]) -> None:
+        """Replace all rows."""
+        self.beginResetModel()
+        self._entries = entries
+        self.endResetModel()
+
+    def entry(self, row: int) -> Optional[Dict[str, Any]]:
+        """Get the entry shown in a row, or None if the row doesn't exist."""
+        if 0 <= row < len(self._entries):
+            return self._entries[row]
+        return None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        entry = self._entries[index.row()]
+        column = index.column()
+        if column == 0:
+            return entry.get('timestamp', '')
+        if column == 1:
+            return f"{entry.get('provider')}/{entry.get('model')}"
+        if column == 2:
+            return _one_line(entry.get('original_prompt', '')[:100])
+        return str(entry.get('tokens_used', 'N/A'))
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)